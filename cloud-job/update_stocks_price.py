@@ -12,6 +12,7 @@
     python update_stocks_price.py                    # 全銘柄処理
     python update_stocks_price.py --codes 7203,8306  # 特定銘柄のみ
     python update_stocks_price.py --days 14           # 取得日数を指定
+    python update_stocks_price.py --workers 8         # 8 スレッドで並行取得
 """
 
 import os
@@ -20,6 +21,8 @@ import time
 import logging
 import argparse
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import pandas as pd
@@ -56,9 +59,75 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--days", type=int, default=7, help="取得する過去日数（デフォルト: 7）"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="銘柄ごとの取得を並行実行するスレッド数（デフォルト: 1 = 逐次）",
+    )
     return parser.parse_args()
 
 
+# e-支店クライアントはプロセス共有のシングルトンで、リクエストごとに p_no を更新するため
+# 並行取得時も Tachibana への問い合わせは1本ずつに絞る
+_tachibana_lock = threading.Lock()
+
+
+def make_stocks_price():
+    """e-支店・J-Quants を設定した株価取得クライアントを生成する"""
+    sp = stocks_price()
+    sp.e_shiten = e_api()
+    sp.jq = jquants_cls()
+    return sp
+
+
+def fetch_stock_price(sp, code, from_date, to_date, jq_bulk_dfs):
+    """
+    1銘柄の株価を J-Quants → Tachibana → Stooq の優先順で取得する
+
+    Returns:
+        DatetimeIndex（名前は "Date"）に正規化した DataFrame。全ソース失敗時は None
+    """
+    # 1) J-Quants（バルクキャッシュ優先、未取得時のみAPIコール）
+    final_df = jq_bulk_dfs.get(code)
+    if final_df is None:
+        for attempt in range(3):
+            try:
+                final_df = sp._fetch_from_jquants(code, from_date, to_date)
+                if final_df is not None and not final_df.empty:
+                    break
+            except Exception:
+                pass
+            if attempt < 2:
+                time.sleep(1)
+
+    # 2) J-Quants 失敗 → Tachibana
+    if final_df is None or final_df.empty:
+        try:
+            with _tachibana_lock:
+                final_df = sp._fetch_from_tachibana(code, from_date, to_date)
+        except Exception:
+            pass
+
+    # 3) Tachibana 失敗 → Stooq
+    if final_df is None or final_df.empty:
+        try:
+            final_df = sp._fetch_from_stooq(code, from_date, to_date)
+        except Exception:
+            pass
+
+    if final_df is None or final_df.empty:
+        return None
+
+    # DatetimeIndex 正規化（全ソース共通・無条件に実行）
+    if "Date" in final_df.columns:
+        final_df = final_df.set_index("Date")
+    if not isinstance(final_df.index, pd.DatetimeIndex):
+        final_df.index = pd.to_datetime(final_df.index)
+    final_df.index.name = "Date"
+    return final_df
+
+
 def main():
     args = parse_arguments()
 
@@ -82,9 +151,7 @@ def main():
     logger.info(f"取得期間: {from_date:%Y-%m-%d} 〜 {to_date:%Y-%m-%d}")
 
     # シングルトン事前初期化
-    sp = stocks_price()
-    sp.e_shiten = e_api()
-    sp.jq = jquants_cls()
+    sp = make_stocks_price()
     mother_db = db_stocks_daily_mother()
 
     # J-Quants 一括プリフェッチ（日付ごとに全銘柄を取得してメモリ上にキャッシュ）
@@ -116,60 +183,35 @@ def main():
 
     logger.info(f"J-Quants 一括取得完了: {len(jq_bulk_dfs)} 銘柄")
 
-    # 逐次処理
+    # 取得は I/O 待ちが大半なので --workers 本のスレッドで並行実行し、
+    # DuckDB への保存は結果を受け取ったメインスレッドで銘柄順に行う
+    # stocks_price はスレッド間で共有せず、ワーカースレッドごとに1つ生成する
     success, failed, errors = 0, 0, []
-
-    for i, code in enumerate(codes, 1):
-        # 1) J-Quants（バルクキャッシュ優先、未取得時のみAPIコール）
-        final_df = jq_bulk_dfs.get(code)
-        if final_df is None:
-            for attempt in range(3):
+    worker_local = threading.local()
+
+    def _fetch(code):
+        worker_sp = getattr(worker_local, "sp", None)
+        if worker_sp is None:
+            worker_sp = worker_local.sp = make_stocks_price()
+        return code, fetch_stock_price(worker_sp, code, from_date, to_date, jq_bulk_dfs)
+
+    with ThreadPoolExecutor(max_workers=max(args.workers, 1)) as executor:
+        for i, (code, final_df) in enumerate(executor.map(_fetch, codes), 1):
+            # 保存
+            if final_df is not None and not final_df.empty:
                 try:
-                    final_df = sp._fetch_from_jquants(code, from_date, to_date)
-                    if final_df is not None and not final_df.empty:
-                        break
-                except Exception:
-                    pass
-                if attempt < 2:
-                    time.sleep(1)
-
-        # 2) J-Quants 失敗 → Tachibana
-        if final_df is None or final_df.empty:
-            try:
-                final_df = sp._fetch_from_tachibana(code, from_date, to_date)
-            except Exception:
-                pass
-
-        # 3) Tachibana 失敗 → Stooq
-        if final_df is None or final_df.empty:
-            try:
-                final_df = sp._fetch_from_stooq(code, from_date, to_date)
-            except Exception:
-                pass
-
-        # DatetimeIndex 正規化（全ソース共通・無条件に実行）
-        if final_df is not None and not final_df.empty:
-            if "Date" in final_df.columns:
-                final_df = final_df.set_index("Date")
-            if not isinstance(final_df.index, pd.DatetimeIndex):
-                final_df.index = pd.to_datetime(final_df.index)
-            final_df.index.name = "Date"
-
-        # 保存
-        if final_df is not None and not final_df.empty:
-            try:
-                mother_db.save_stock_prices(code, final_df)
-                success += 1
-            except Exception as e:
-                logger.error(f"銘柄 {code} の保存に失敗: {e}")
+                    mother_db.save_stock_prices(code, final_df)
+                    success += 1
+                except Exception as e:
+                    logger.error(f"銘柄 {code} の保存に失敗: {e}")
+                    failed += 1
+                    errors.append(code)
+            else:
                 failed += 1
                 errors.append(code)
-        else:
-            failed += 1
-            errors.append(code)
 
-        if i % 100 == 0 or i == len(codes):
-            logger.info(f"進捗: {i}/{len(codes)} (成功={success}, 失敗={failed})")
+            if i % 100 == 0 or i == len(codes):
+                logger.info(f"進捗: {i}/{len(codes)} (成功={success}, 失敗={failed})")
 
     # サマリー
     logger.info(f"完了: 成功={success}, 失敗={failed}")
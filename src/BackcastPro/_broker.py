@@ -61,6 +61,12 @@ class _Broker:
         assert cash > 0, f"cash should be > 0, is {cash}"
         assert 0 < margin <= 1, f"margin should be between 0 and 1, is {margin}"
         self._data: dict[str, pd.DataFrame] = data
+        # last_price() 用に各銘柄の終値配列を保持する
+        # （Backtest.step() は _data を各銘柄の先頭からのスライスに差し替えるため、
+        #   スライスの行数 - 1 が終値配列上の現在位置になる）
+        self._close_arrays: dict[str, np.ndarray] = {
+            code: df['Close'].to_numpy() for code, df in data.items()
+        }
         self._cash = cash
 
         # 手数料の登録
@@ -162,7 +168,11 @@ class _Broker:
 
     def last_price(self, code: str) -> float:
         """ Price at the last (current) close. """
-        return self._data[code].Close.iloc[-1]
+        df = self._data[code]
+        close = self._close_arrays.get(code)
+        if close is None or len(df) > len(close):
+            return df.Close.iloc[-1]
+        return close[len(df) - 1]
 
     def _adjusted_price(self, code: str, size=None, price=None) -> float:
         """
@@ -12,25 +12,36 @@ if TYPE_CHECKING:
    from .trade import Trade
 
 def compute_drawdown_duration_peaks(dd: pd.Series):
-    iloc = np.unique(np.r_[(dd == 0).values.nonzero()[0], len(dd) - 1])
-    iloc = pd.Series(iloc, index=dd.index[iloc])
-    df = iloc.to_frame('iloc').assign(prev=iloc.shift())
-    df = df[df['iloc'] > df['prev'] + 1].astype(np.int64)
+    arr = dd.to_numpy(dtype=np.float64)
+    iloc = np.unique(np.r_[np.flatnonzero(arr == 0), len(arr) - 1])
+    # 隣り合うドローダウン0の位置の間に1本以上のバーがあれば、そこが1つのドローダウン期間
+    prev, end = iloc[:-1], iloc[1:]
+    is_episode = end > prev + 1
+    prev, end = prev[is_episode], end[is_episode]
 
     # 取引がないためドローダウンがない場合、pandasの都合上以下を避けてnanシリーズを返す
-    if not len(df):
+    if not len(end):
         return (dd.replace(0, np.nan),) * 2
 
-    df['duration'] = df['iloc'].map(dd.index.__getitem__) - df['prev'].map(dd.index.__getitem__)
-    df['peak_dd'] = df.apply(lambda row: dd.iloc[row['prev']:row['iloc'] + 1].max(), axis=1)
-    df = df.reindex(dd.index)
-    return df['duration'], df['peak_dd']
+    # 各期間の内側 [prev+1, end) の最大値を reduceat でまとめて求め、両端の値と合わせる
+    # （fmax は NaN を無視するので、pandas の max(skipna=True) と同じ結果になる）
+    inner_peaks = np.fmax.reduceat(arr, np.c_[prev + 1, end].ravel())[::2]
+    peak_dd = np.fmax(np.fmax(inner_peaks, arr[end]), arr[prev])
+
+    index = dd.index[end]
+    duration = pd.Series(index - dd.index[prev], index=index, name='duration')
+    peak_dd = pd.Series(peak_dd, index=index, name='peak_dd')
+    return duration.reindex(dd.index), peak_dd.reindex(dd.index)
 
 def geometric_mean(returns: pd.Series) -> float:
-    returns = returns.fillna(0) + 1
-    if np.any(returns <= 0):
+    # 空の場合は配列の変換・ufunc 呼び出しを行わずに NaN を返す
+    if not len(returns):
+        return np.nan
+    # NaN は 0 として扱い、ndarray 上で log1p/expm1 により1パスで計算する
+    arr = returns.to_numpy(dtype=np.float64, na_value=0.0)
+    if np.any(arr <= -1):
         return 0
-    return np.exp(np.log(returns).sum() / (len(returns) or np.nan)) - 1
+    return float(np.expm1(np.log1p(arr).mean()))
 
 def _data_period(index) -> Union[pd.Timedelta, Number]:
     """データインデックスの期間をpd.Timedeltaとして返す"""
@@ -47,21 +58,27 @@ def compute_stats(
     assert -1 < risk_free_rate < 1
 
    
+    # 以降のドローダウン計算は pandas を介さず float64 の ndarray 上で行う
+    equity = np.asarray(equity, dtype=np.float64)
+
     # エクイティカーブとインデックスの長さを一致させる
     if len(equity) > len(index):
         equity = equity[:len(index)]
     elif len(equity) < len(index):
         # エクイティカーブが短い場合は、0で埋める
-        equity = np.concatenate([equity, np.full(len(index) - len(equity), 0)])
-    
-    dd = 1 - equity / np.maximum.accumulate(equity)
+        equity = np.concatenate([equity, np.zeros(len(index) - len(equity))])
+
+    peak = np.maximum.accumulate(equity)
+    dd = 1.0 - equity / peak
     dd_dur, dd_peaks = compute_drawdown_duration_peaks(pd.Series(dd, index=index))
 
-    equity_df = pd.DataFrame({
-        'Equity': equity,
-        'DrawdownPct': dd,
-        'DrawdownDuration': dd_dur},
-        index=index)
+    # 数値列は1つの float64 ブロックとしてまとめて渡し、列ごとの確保・統合を避ける
+    equity_df = pd.DataFrame(
+        np.column_stack((equity, dd)),
+        index=index,
+        columns=['Equity', 'DrawdownPct'],
+        copy=False)
+    equity_df['DrawdownDuration'] = dd_dur
 
     if isinstance(trades, pd.DataFrame):
         trades_df: pd.DataFrame = trades
@@ -104,9 +121,15 @@ def compute_stats(
     s.loc['End'] = index[-1]
     s.loc['Duration'] = s.End - s.Start
 
-    have_position = np.repeat(0, len(index))
-    for t in trades_df.itertuples(index=False):
-        have_position[t.EntryBar:t.ExitBar + 1] = 1
+    # 各取引の保有区間 [EntryBar, ExitBar] を差分配列の累積和で塗りつぶす（取引ごとのループを避ける）
+    n_bars = len(index)
+    starts = np.clip(trades_df['EntryBar'].to_numpy(dtype=np.int64), 0, n_bars)
+    stops = np.clip(trades_df['ExitBar'].to_numpy(dtype=np.int64) + 1, 0, n_bars)
+    is_held = starts < stops
+    position_delta = np.zeros(n_bars + 1, dtype=np.int64)
+    np.add.at(position_delta, starts[is_held], 1)
+    np.add.at(position_delta, stops[is_held], -1)
+    have_position = np.cumsum(position_delta[:-1]) > 0
 
     s.loc['Exposure Time [%]'] = have_position.mean() * 100  # "n bars"時間単位、インデックス時間ではない
     s.loc['Equity Final [$]'] = equity[-1]
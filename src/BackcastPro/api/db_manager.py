@@ -9,6 +9,18 @@ from contextlib import contextmanager
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# トランザクション内で同じ値を返すため、1回評価した値を全行に使ってよいデフォルト
+_STABLE_DEFAULT_FUNCTIONS = frozenset(
+    {
+        "current_timestamp",
+        "current_date",
+        "current_time",
+        "now()",
+        "get_current_timestamp()",
+        "transaction_timestamp()",
+    }
+)
+
 
 class db_manager:
     """
@@ -94,13 +106,8 @@ class db_manager:
             elif pd.api.types.is_bool_dtype(dtype):
                 sql_type = "BOOLEAN"
             else:
-                # 文字列型の場合、最大長を推定
-                max_length = df[col].astype(str).str.len().max()
-                if pd.isna(max_length) or max_length == 0:
-                    max_length = 255
-                else:
-                    max_length = min(max_length * 2, 1000)  # 余裕を持たせる
-                sql_type = f"VARCHAR({max_length})"
+                # DuckDBはVARCHARの長さ指定を無視するため、最大長の推定は行わない
+                sql_type = "VARCHAR"
 
             # 列名はダブルクオートで明示して大文字小文字を保持
             columns.append(f'"{col}" {sql_type}')
@@ -168,8 +175,8 @@ class db_manager:
         key: str,
     ):
 
-        # カラム整合性チェック
-        self._validate_table_schema(db_connection, table_name, df, key)
+        # カラム整合性チェック（取得したカラム情報は挿入時に再利用する）
+        table_info = self._validate_table_schema(db_connection, table_name, df, key)
 
         # 既存のkeyのみを取得（パフォーマンス最適化）
         existing_count = db_connection.execute(
@@ -179,7 +186,9 @@ class db_manager:
         if existing_count == 0:
             # 既存データが空の場合は全データを挿入
             logger.info("既存データが空のため、全データを挿入します")
-            self._batch_insert_data(db_connection, table_name, df)
+            self._batch_insert_data(
+                db_connection, table_name, df, table_info=table_info
+            )
         else:
             # 既存データと新データを比較してユニークな行のみを追加
             if key in df.columns:
@@ -206,13 +215,17 @@ class db_manager:
                     logger.info(f"新規データ {len(new_data_df)} 件を追加します")
 
                     # バッチで新規データを挿入
-                    self._batch_insert_data(db_connection, table_name, new_data_df)
+                    self._batch_insert_data(
+                        db_connection, table_name, new_data_df, table_info=table_info
+                    )
                 else:
                     logger.info("新規データはありません")
             else:
                 # keyがない場合は全データを挿入（重複チェックなし）
                 logger.warning(f"{key}カラムが見つからないため、全データを挿入します")
-                self._batch_insert_data(db_connection, table_name, df)
+                self._batch_insert_data(
+                    db_connection, table_name, df, table_info=table_info
+                )
 
     def __create_db__(
         self,
@@ -240,7 +253,7 @@ class db_manager:
         table_name: str,
         df: pd.DataFrame,
         key: str,
-    ) -> None:
+    ) -> list | None:
         """
         既存テーブルと新データのカラム整合性をチェック
 
@@ -248,15 +261,21 @@ class db_manager:
             table_name (str): テーブル名
             df (pd.DataFrame): 新データ
 
+        Returns:
+            list | None: 取得したPRAGMA table_infoの結果（_batch_insert_dataで再利用する）。
+                取得に失敗した場合はNone
+
         Raises:
             ValueError: カラム構造に不整合がある場合
         """
+        table_info = None
         try:
             # テーブルのカラム情報を取得
+            # (cid, name, type, notnull, dflt_value, pk) の2番目がカラム名
             table_info = db_connection.execute(
                 f"PRAGMA table_info({table_name})"
-            ).fetchdf()
-            existing_columns = set(table_info["name"].tolist())
+            ).fetchall()
+            existing_columns = {row[1] for row in table_info}
             new_columns = set(df.columns.tolist())
 
             # メタデータカラムは自動設定されるため、チェック対象から除外
@@ -288,12 +307,15 @@ class db_manager:
             if key in str(e):
                 raise
 
+        return table_info
+
     def _batch_insert_data(
         self,
         db_connection: duckdb.DuckDBPyConnection,
         table_name: str,
         df: pd.DataFrame,
         batch_size: int = 1000,
+        table_info: list = None,
     ) -> None:
         """
         大量データを効率的にバッチ挿入
@@ -303,15 +325,26 @@ class db_manager:
             table_name (str): 挿入先テーブル名
             df (pd.DataFrame): 挿入するデータ
             batch_size (int): バッチサイズ（デフォルト: 1000件）
+            table_info (list): 取得済みのPRAGMA table_infoの結果（省略時は必要になった時点で取得）
         """
         total_rows = len(df)
 
+        # 重複が起こり得なければ ON CONFLICT は不要なため、
+        # SQLエンジンを経由しない Appender で直接追記する
+        # （カラムの対応付けとデフォルト値の評価はチャンクごとではなく1回だけ行う）
+        conflict_free = self._can_append_without_conflict(
+            db_connection, table_name, df
+        )
+        append_plan = (
+            self._resolve_append_plan(db_connection, table_name, df, table_info)
+            if conflict_free
+            else None
+        )
+
         if total_rows <= batch_size:
             # 小さなデータは一括挿入
-            db_connection.register("temp_df", df)
-            df_columns = ", ".join(df.columns)
-            db_connection.execute(
-                f"INSERT INTO {table_name} ({df_columns}) SELECT {df_columns} FROM temp_df ON CONFLICT DO NOTHING"
+            self._insert_chunk(
+                db_connection, table_name, df, "temp_df", conflict_free, append_plan
             )
             logger.debug(f"データを一括挿入しました: {total_rows}件")
         else:
@@ -324,10 +357,13 @@ class db_manager:
                 chunk = df.iloc[i : i + batch_size]
                 chunk_name = f"statements_chunk_{i // batch_size}"
 
-                db_connection.register(chunk_name, chunk)
-                df_columns = ", ".join(chunk.columns)
-                db_connection.execute(
-                    f"INSERT INTO {table_name} ({df_columns}) SELECT {df_columns} FROM {chunk_name} ON CONFLICT DO NOTHING"
+                self._insert_chunk(
+                    db_connection,
+                    table_name,
+                    chunk,
+                    chunk_name,
+                    conflict_free,
+                    append_plan,
                 )
 
                 # 進捗をログ出力
@@ -338,6 +374,157 @@ class db_manager:
 
             logger.info(f"バッチ挿入完了: {total_rows}件")
 
+    def _get_unique_constraints(
+        self, db_connection: duckdb.DuckDBPyConnection, table_name: str
+    ) -> list | None:
+        """
+        テーブルのPRIMARY KEY / UNIQUE制約のカラム名リストを取得
+
+        制約情報を取得できなかった場合はNoneを返す
+        """
+        try:
+            rows = db_connection.execute(
+                "SELECT constraint_column_names FROM duckdb_constraints() "
+                "WHERE database_name = current_database() "
+                "AND schema_name = current_schema() "
+                "AND table_name = ? AND constraint_type IN ('PRIMARY KEY', 'UNIQUE')",
+                [table_name],
+            ).fetchall()
+            return [list(row[0]) for row in rows]
+        except duckdb.Error as e:
+            logger.warning(f"制約情報の取得に失敗しました: {table_name}: {e}")
+            return None
+
+    def _can_append_without_conflict(
+        self,
+        db_connection: duckdb.DuckDBPyConnection,
+        table_name: str,
+        df: pd.DataFrame,
+    ) -> bool:
+        """
+        ON CONFLICT なしで追記しても制約違反が起きないかを判定
+
+        制約がないテーブル、または空のテーブルに制約カラムの重複がない
+        DataFrameを入れる場合（新規作成直後の初回ロード）はTrueを返す
+        制約情報を取得できない場合は制約ありとみなしてFalseを返す
+        """
+        constraints = self._get_unique_constraints(db_connection, table_name)
+        if constraints is None:
+            return False
+        if not constraints:
+            return True
+
+        has_rows = db_connection.execute(
+            f"SELECT 1 FROM {table_name} LIMIT 1"
+        ).fetchone()
+        if has_rows:
+            return False
+
+        for columns in constraints:
+            if any(col not in df.columns for col in columns):
+                return False
+            if df.duplicated(subset=columns).any():
+                return False
+        return True
+
+    def _resolve_append_plan(
+        self,
+        db_connection: duckdb.DuckDBPyConnection,
+        table_name: str,
+        df: pd.DataFrame,
+        table_info: list = None,
+    ) -> tuple | None:
+        """
+        Appenderで追記するためのカラムの対応付けを解決
+
+        append(by_name=True)のない古いDuckDBでも動くよう、DataFrameのカラムを
+        INSERTと同じく大文字小文字を区別せずにテーブルのカラムへ対応付け、
+        DataFrameにないカラムのデフォルト値を1回だけ評価する。
+        nextval()など行ごとに値が変わるデフォルトを持つカラムが欠けている場合は
+        Appenderを使わずINSERTするためNoneを返す
+
+        Returns:
+            tuple | None: (テーブルのカラム順のカラム名リスト,
+                DataFrameのカラム名からテーブルのカラム名への変換辞書,
+                欠けているカラムのデフォルト値の辞書)
+
+        Raises:
+            ValueError: テーブルにないカラムがDataFrameにある場合
+        """
+        # (cid, name, type, notnull, dflt_value, pk) の2番目がカラム名、5番目がデフォルト値
+        if table_info is None:
+            table_info = db_connection.execute(
+                f"PRAGMA table_info({table_name})"
+            ).fetchall()
+        table_columns = {row[1].lower(): row[1] for row in table_info}
+
+        rename = {}
+        for col in df.columns:
+            table_col = table_columns.get(str(col).lower())
+            if table_col is None:
+                raise ValueError(
+                    f"テーブル {table_name} に存在しないカラムがあります: {col}"
+                )
+            rename[col] = table_col
+
+        mapped = set(rename.values())
+        missing = [row for row in table_info if row[1] not in mapped]
+        if any(not self._is_stable_default(row[4]) for row in missing):
+            return None
+
+        defaults = {}
+        if missing:
+            values = db_connection.execute(
+                "SELECT "
+                + ", ".join(
+                    f"CAST({row[4] if row[4] is not None else 'NULL'} AS {row[2]})"
+                    for row in missing
+                )
+            ).fetchone()
+            defaults = {row[1]: value for row, value in zip(missing, values)}
+
+        return [row[1] for row in table_info], rename, defaults
+
+    def _is_stable_default(self, default: str | None) -> bool:
+        """デフォルト値がNULL・定数・トランザクション時刻のいずれかかを判定"""
+        if default is None:
+            return True
+        default = default.strip().lower()
+        return default in _STABLE_DEFAULT_FUNCTIONS or "(" not in default
+
+    def _insert_chunk(
+        self,
+        db_connection: duckdb.DuckDBPyConnection,
+        table_name: str,
+        chunk: pd.DataFrame,
+        view_name: str,
+        conflict_free: bool,
+        append_plan: tuple | None = None,
+    ) -> None:
+        """
+        DataFrameの1チャンクをテーブルに挿入
+
+        Args:
+            db_connection (duckdb.DuckDBPyConnection): DuckDB接続
+            table_name (str): 挿入先テーブル名
+            chunk (pd.DataFrame): 挿入するデータ
+            view_name (str): INSERT時に登録するビュー名
+            conflict_free (bool): Trueの場合は制約違反が起きないためON CONFLICTを付けない
+            append_plan (tuple | None): _resolve_append_planの結果。指定された場合はAppenderで追記
+        """
+        if append_plan is not None:
+            columns, rename, defaults = append_plan
+            chunk = chunk.rename(columns=rename).assign(**defaults)
+            db_connection.append(table_name, chunk[columns])
+            return
+
+        db_connection.register(view_name, chunk)
+        df_columns = ", ".join(chunk.columns)
+        on_conflict = "" if conflict_free else " ON CONFLICT DO NOTHING"
+        db_connection.execute(
+            f"INSERT INTO {table_name} ({df_columns}) SELECT {df_columns} FROM {view_name}{on_conflict}"
+        )
+
     def _normalize_code(self, code: str = None) -> str | None:
         """銘柄コードを正規化（5桁の末尾0を除去して4桁にする）"""
         if code and len(code) > 4:
@@ -2,7 +2,7 @@ from .db_manager import db_manager
 import pandas as pd
 import duckdb
 import os
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from datetime import datetime
 import logging
 logger = logging.getLogger(__name__)
@@ -130,12 +130,7 @@ class db_stocks_board(db_manager):
 
             # Timestampカラムの確認と処理
             # まず、Timestampがインデックスになっている場合はカラムとして追加
-            if df.index.name == 'Timestamp' or isinstance(df.index, pd.DatetimeIndex):
-                if 'Timestamp' not in df.columns:
-                    df = df.reset_index()
-                    logger.info("TimestampインデックスをカラムとしてDataFrameに追加しました")
-                else:
-                    df = df.reset_index(drop=True)
+            df = self._timestamp_index_to_column(df)
 
             # Timestampカラムがない場合は現在時刻を追加
             if 'Timestamp' not in df.columns:
@@ -251,6 +246,69 @@ class db_stocks_board(db_manager):
             raise
 
 
+    def save_stock_board_many(self, code: str, dfs: List[pd.DataFrame]) -> None:
+        """
+        複数の板情報DataFrameをまとめてDuckDBに保存
+
+        DB接続・トランザクション・メタデータ更新を1回にまとめるため、
+        save_stock_boardを繰り返し呼ぶより高速
+
+        Args:
+            code (str): 銘柄コード
+            dfs (List[pd.DataFrame]): 板情報のDataFrameのリスト
+        """
+        frames = [df for df in dfs if df is not None and not df.empty]
+        if not frames:
+            logger.info("板情報データが空のため保存をスキップしました")
+            return
+
+        # インデックスのTimestampとカラムのTimestampが混在しても失われないよう、
+        # 各DataFrameでTimestampをカラムに揃えてから連結する
+        df = pd.concat(
+            [self._timestamp_index_to_column(frame) for frame in frames],
+            ignore_index=True,
+        )
+
+        self.save_stock_board(code, df)
+
+    def _timestamp_index_to_column(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Timestampがインデックスになっている場合はカラムに移す"""
+        if df.index.name == 'Timestamp' or isinstance(df.index, pd.DatetimeIndex):
+            if 'Timestamp' not in df.columns:
+                df = df.reset_index()
+                logger.info("TimestampインデックスをカラムとしてDataFrameに追加しました")
+            else:
+                df = df.reset_index(drop=True)
+        return df
+
+
+    def _parse_timestamp_column(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        文字列で保存されているTimestamp列をdatetime64型に変換
+
+        DuckDBのCASTは解釈できない文字列でクエリ全体が失敗し、+09:00などの
+        オフセットも落とすため、取得後にpandas側で変換する（解釈できない値はNaT）
+
+        オフセットなしの値とオフセット付きの値（または異なるオフセット）が混在する場合は
+        要素ごとに解析し、オフセット付きの値を日本時間に換算してオフセットなしに揃える
+        """
+        try:
+            df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='mixed', errors='coerce')
+        except ValueError:
+            # errors='coerce' でもタイムゾーンの混在は例外になる
+            df['Timestamp'] = pd.to_datetime(
+                df['Timestamp'].map(self._parse_timestamp_value)
+            )
+        return df
+
+    @staticmethod
+    def _parse_timestamp_value(value) -> pd.Timestamp:
+        """Timestampの1要素を日本時間のオフセットなしTimestampに変換（解釈できない値はNaT）"""
+        ts = pd.to_datetime(value, errors='coerce')
+        if pd.notna(ts) and ts.tzinfo is not None:
+            ts = ts.tz_convert('Asia/Tokyo').tz_localize(None)
+        return ts
+
     def load_stock_board_from_cache(self, code: str, at: datetime = None, from_: datetime = None, to: datetime = None) -> pd.DataFrame:
         """
         板情報をDuckDBから取得
@@ -262,7 +320,9 @@ class db_stocks_board(db_manager):
             to (datetime, optional): 終了時刻
 
         Returns:
-            pd.DataFrame: 板情報データ
+            pd.DataFrame: 板情報データ（Timestamp列は文字列ではなくdatetime64型。
+                全行が同じオフセット付きで保存されている場合はタイムゾーン付きのdatetime64型、
+                オフセットの有無が混在する場合は日本時間に揃えたオフセットなしのdatetime64型）
         """
         try:
             if not self.isEnable:
@@ -311,6 +371,7 @@ class db_stocks_board(db_manager):
                             df = db.execute(query_after, [search_code, target_timestamp, date_end]).fetchdf()
 
                         if not df.empty:
+                            df = self._parse_timestamp_column(df)
                             logger.info(f"板情報をDuckDBから読み込みました: {search_code} (時刻: {df['Timestamp'].iloc[0]})")
                             return df
 
@@ -342,6 +403,7 @@ class db_stocks_board(db_manager):
                         df = db.execute(query, params).fetchdf()
 
                         if not df.empty:
+                            df = self._parse_timestamp_column(df)
                             logger.info(f"板情報をDuckDBから読み込みました: {search_code} ({len(df)}件)")
                             return df
 
@@ -355,6 +417,7 @@ class db_stocks_board(db_manager):
                         df = db.execute(query, [search_code]).fetchdf()
 
                         if not df.empty:
+                            df = self._parse_timestamp_column(df)
                             logger.info(f"板情報をDuckDBから読み込みました: {search_code} ({len(df)}件)")
                             return df
 
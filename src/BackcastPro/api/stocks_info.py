@@ -51,7 +51,7 @@ class stocks_info:
             
             # 銘柄名称を取得（CompanyNameカラムから）
             if not df_info.empty and 'CompanyName' in df_info.columns:
-                company_name = df_info.iloc[0]['CompanyName']
+                company_name = df_info['CompanyName'].iat[0]
                 if pd.notna(company_name) and company_name:
                     title = str(company_name)
         except Exception as e:
@@ -544,19 +544,32 @@ class Backtest:
             dict: current_time, progress, equity, cash, position, positions,
                   closed_trades, step_index, total_steps を含む辞書
         """
+        # ブローカーの状態は1回だけ読み、プロパティ経由の取引リストのコピーや
+        # ポジションの再集計を避ける
+        broker = self._broker_instance if self._is_started else None
         positions: dict[str, int] = {}
-        for trade in self.trades:
-            code = trade.code
-            positions[code] = positions.get(code, 0) + trade.size
-
+        position_size = 0
+        if broker is not None:
+            for trade in broker.trades:
+                code = trade.code
+                positions[code] = positions.get(code, 0) + trade.size
+                position_size += trade.size
+            equity = broker.equity
+            cash = broker.cash
+            closed_trades = len(broker.closed_trades)
+        else:
+            equity = cash = self._broker_factory.keywords.get('cash', 0)
+            closed_trades = 0
+
+        current_time = self.current_time
         return {
-            "current_time": str(self.current_time) if self.current_time else "-",
+            "current_time": str(current_time) if current_time is not None else "-",
             "progress": float(self.progress),
-            "equity": float(self.equity),
-            "cash": float(self.cash),
-            "position": self.position.size,
+            "equity": float(equity),
+            "cash": float(cash),
+            "position": position_size,
             "positions": positions,
-            "closed_trades": len(self.closed_trades),
+            "closed_trades": closed_trades,
             "step_index": self.step_index,
             "total_steps": len(self.index) if hasattr(self, "index") else 0,
         }
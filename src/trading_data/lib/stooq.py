@@ -1,6 +1,7 @@
 import pandas as pd
 import requests
-from .util import PRICE_LIMIT_TABLE
+import numpy as np
+from .util import price_limit_array
 try:
     import yfinance as yf
 except ImportError:
@@ -243,6 +244,20 @@ def _add_adjustment_prices(df: pd.DataFrame) -> pd.DataFrame:
     return result_df
 
 
+def _round_tenth(values: np.ndarray) -> np.ndarray:
+    """
+    配列の各要素を Python の round(x, 1) と同じ結果になるよう小数第1位に丸める
+
+    np.round は x*10 の端数がちょうど 0.5 付近の値で round() と結果が異なることがあるため、
+    その付近の要素だけ組み込みの round で計算し直す。
+    """
+    rounded = np.round(values, 1)
+    scaled = values * 10
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    rounded[near_half] = [round(value, 1) for value in values[near_half].tolist()]
+    return rounded
+
+
 def _add_price_limits(df: pd.DataFrame) -> pd.DataFrame:
     """
     DataFrameに値幅制限（ストップ高・ストップ安）を追加する
@@ -257,49 +272,19 @@ def _add_price_limits(df: pd.DataFrame) -> pd.DataFrame:
     if 'UpperLimit' in df.columns and 'LowerLimit' in df.columns:
         return df
 
-    def _get_price_limit_range(price: float, expansion: int = 1) -> tuple[float, float]:
-        """
-        東証の値幅制限（ストップ高・ストップ安）を計算する
-        
-        Args:
-            price: 基準値（通常は前営業日の終値）
-            expansion: 値幅制限の拡大倍率（1=通常, 2=2倍, 3=3倍...）
-        
-        Returns:
-            (upper_limit, lower_limit): ストップ高とストップ安の価格のタプル
-        
-        Raises:
-            ValueError: 価格が負の値など無効な場合
-        """
-        # 東証の値幅制限テーブル: (基準価格の上限, 値幅)
-        # 該当する値幅を検索
-        for limit_price, width in PRICE_LIMIT_TABLE:
-            if price < limit_price:
-                adjusted_width = width * expansion
-                upper_limit = round(price + adjusted_width, 1)
-                lower_limit = round(price - adjusted_width, 1)
-                return upper_limit, lower_limit
-        
-        raise ValueError(f"Invalid price: {price}")
-
     result_df = df.copy()
     
-    # 前日終値を基準に値幅制限を計算
-    prev_close = result_df['Close'].shift(1)
-    
-    # ストップ高・ストップ安を計算（初日はNone）
-    def calculate_limits(price):
-        if pd.notna(price):
-            return _get_price_limit_range(price)
-        return None, None
+    # 前日終値を基準に値幅制限を計算（初日はNaN）
+    prev_close = result_df['Close'].shift(1).to_numpy(dtype=np.float64, na_value=np.nan)
     
-    limits = prev_close.apply(calculate_limits)
+    # 東証の値幅制限テーブルから前日終値ごとの値幅を二分探索でまとめて求める
+    widths = price_limit_array(prev_close)
 
     if not 'UpperLimit' in result_df.columns:
-        result_df['UpperLimit'] = limits.apply(lambda x: x[0])
+        result_df['UpperLimit'] = _round_tenth(prev_close + widths)
 
     if not 'LowerLimit' in result_df.columns:
-        result_df['LowerLimit'] = limits.apply(lambda x: x[1])
+        result_df['LowerLimit'] = _round_tenth(prev_close - widths)
     
     return result_df
 
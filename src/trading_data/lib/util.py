@@ -1,8 +1,13 @@
+import functools
+import re
+from datetime import date, datetime
+
+import numpy as np
 import pandas as pd
 
 
-# 東証の値幅制限テーブル: (基準価格の上限, 値幅)
-PRICE_LIMIT_TABLE = [
+# 東証の値幅制限テーブル: (基準価格の上限, 値幅)（変更されないよう tuple で保持する）
+PRICE_LIMIT_TABLE = (
     (100, 30),
     (200, 50),
     (500, 80),
@@ -18,7 +23,81 @@ PRICE_LIMIT_TABLE = [
     (20000, 4000),
     (30000, 5000),
     (float('inf'), 10000),
-]
+)
+
+# 値幅の検索用に、テーブルを上限・値幅の配列に分けて保持する（二分探索で引く）
+_LIMIT_UPPERS = np.array([upper for upper, _ in PRICE_LIMIT_TABLE], dtype=np.float64)
+_LIMIT_WIDTHS = np.array([width for _, width in PRICE_LIMIT_TABLE], dtype=np.int64)
+if not np.all(np.diff(_LIMIT_UPPERS) > 0):
+    raise ValueError("PRICE_LIMIT_TABLE は基準価格の上限で昇順に並べること")
+
+
+def price_limit_array(prices) -> np.ndarray:
+    """
+    基準価格の配列に対する値幅を float64 配列でまとめて返す（NaN・inf の要素は NaN）
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    widths = np.full(prices.shape, np.nan)
+    valid = np.isfinite(prices)
+    widths[valid] = _LIMIT_WIDTHS[np.searchsorted(_LIMIT_UPPERS, prices[valid], side='right')]
+    return widths
+
+
+# "2024/01/15" 形式（日本でよく使われるスラッシュ区切りの日付）
+_SLASH_DATE_RE = re.compile(r'([0-9]{4})/([0-9]{1,2})/([0-9]{1,2})')
+# fromisoformat の結果が pandas と食い違う文字列（7桁以上の小数秒・週番号）
+_ISO_FALLBACK_RE = re.compile(r'[.,][0-9]{7,}|[Ww]')
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_fixed_format_str(value: str) -> pd.Timestamp | None:
+    """
+    ISO 8601 / スラッシュ区切りの日付文字列を解析する（同じ文字列の再解析を避けるためキャッシュする）
+
+    結果が文字列だけで決まる形式に限るため、キャッシュした結果をそのまま共有してよい。
+    どちらの形式でもない場合は None を返す。
+    """
+    # ISO 8601 形式は標準ライブラリ（C実装）で解析する。pandas の汎用パーサより大幅に速い
+    # ただし fromisoformat は7桁以上の小数秒をマイクロ秒に切り捨て、pandas が受け付けない
+    # 週番号形式（2024-W03-1）も解析してしまうため、それらは pandas に任せる
+    if not _ISO_FALLBACK_RE.search(value):
+        try:
+            return pd.Timestamp(datetime.fromisoformat(value))
+        except ValueError:
+            pass
+    # スラッシュ区切りの日付は年月日を直接渡して生成する（pandas の汎用パーサを通さない）
+    match = _SLASH_DATE_RE.fullmatch(value)
+    if match:
+        return pd.Timestamp(*map(int, match.groups()))
+    return None
+
+
+def _parse_timestamp_str(value: str) -> pd.Timestamp:
+    """
+    日付文字列を pandas.Timestamp に変換する
+
+    それ以外の形式は pandas に任せる。"now" や "today" のように呼び出し時刻で
+    結果が変わる文字列があるため、こちらはキャッシュしない。
+    """
+    ts = _parse_fixed_format_str(value)
+    if ts is not None:
+        return ts
+    return pd.to_datetime(value, errors='raise')
+
+
+def _to_timestamp_generic(value) -> pd.Timestamp:
+    """型別の変換が用意されていない入力（numpy.datetime64 など）を pandas に任せて変換する"""
+    return pd.to_datetime(value, errors='raise')
+
+
+# 入力の型ごとの変換関数（type() で直接引き、isinstance の連鎖と pandas の汎用判定を避ける）
+# pandas.Timestamp は strftime を持つため、そのまま返す
+_TIMESTAMP_CONVERTERS = {
+    str: _parse_timestamp_str,
+    pd.Timestamp: lambda ts: ts,
+    datetime: pd.Timestamp,
+    date: pd.Timestamp,
+}
 
 
 def _Timestamp(value):
@@ -30,9 +109,8 @@ def _Timestamp(value):
     """
     if value is None:
         return None
+    convert = _TIMESTAMP_CONVERTERS.get(type(value), _to_timestamp_generic)
     try:
-        ts = pd.to_datetime(value, errors='raise')
-        # pandas.Timestamp は strftime を持つため、そのまま返す
-        return ts
+        return convert(value)
     except Exception:
         raise ValueError(f"日付パラメータの形式が不正です: {value}")
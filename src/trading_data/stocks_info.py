@@ -18,6 +18,8 @@ class stocks_info:
     def __init__(self):
         self.db = db_stocks_info()
         self.jq = jquants()
+        # 正規化済みの銘柄コード -> 銘柄名称（取得できた名称のみ保持する）
+        self._company_name_cache: dict[str, str] = {}
 
     def _fetch_from_jquants(
         self, code: str = "", date: datetime = None
@@ -49,6 +51,8 @@ class stocks_info:
         # 1) J-Quantsから取得
         df = self._fetch_from_jquants(code=code, date=date)
         if df is not None:
+            # 銘柄一覧を取り直したので、銘柄名称のキャッシュも破棄する
+            self._company_name_cache.clear()
             # DataFrameをcacheフォルダに保存
             # 非同期、遅延を避けるためスレッドで実行するが、メインプロセス終了で中断されないようdaemon=Falseに変更
             threading.Thread(
@@ -73,6 +77,22 @@ class stocks_info:
         )
         raise ValueError(error_msg)
 
+    def _query_company_name(self, code: str) -> str | None:
+        """
+        J-Quantsから銘柄名称を取得する
+
+        Returns:
+            str | None: 銘柄名称。取得できなければNone
+        """
+        df_info = self.jq.get_listed_info(code=code)
+
+        # 銘柄名称を取得（CompanyNameカラムから）
+        if not df_info.empty and "CompanyName" in df_info.columns:
+            company_name = df_info["CompanyName"].iat[0]
+            if pd.notna(company_name) and company_name:
+                return str(company_name)
+        return None
+
     def get_company_name(self, code: str):
         """
         銘柄コードを指定して銘柄名称を取得する
@@ -88,14 +108,12 @@ class stocks_info:
             if "." in code_for_lookup:
                 code_for_lookup = code_for_lookup.split(".")[0]
 
-            # 銘柄情報を取得
-            df_info = self.jq.get_listed_info(code=code_for_lookup)
-
-            # 銘柄名称を取得（CompanyNameカラムから）
-            if not df_info.empty and "CompanyName" in df_info.columns:
-                company_name = df_info.iloc[0]["CompanyName"]
-                if pd.notna(company_name) and company_name:
-                    title = str(company_name)
+            # 銘柄情報を取得（同じ銘柄コードはキャッシュから返す）
+            title = self._company_name_cache.get(code_for_lookup)
+            if title is None:
+                title = self._query_company_name(code_for_lookup)
+                if title is not None:
+                    self._company_name_cache[code_for_lookup] = title
         except Exception as e:
             # エラーが発生してもチャートの表示は継続（タイトルなしで表示）
             print(f"警告: 銘柄名称の取得に失敗しました: {e}", file=sys.stderr)
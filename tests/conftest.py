@@ -0,0 +1,224 @@
+"""
+テスト共通設定
+"""
+
+import functools
+import os
+import shutil
+import sys
+import tempfile
+from unittest.mock import create_autospec
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# cloud-job/ のスクリプト（update_stocks_price など）はパッケージ外なので、
+# src/ と合わせて収集開始時に1度だけ sys.path に追加する
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for _path in (os.path.join(_REPO_ROOT, "cloud-job"), os.path.join(_REPO_ROOT, "src")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+# tmpfs (RAM) 上に一時ディレクトリを作成できる場所
+TMPFS_DIR = "/dev/shm"
+
+# 手動実行用のデバッグスクリプト（実APIを呼び出す）は収集対象から外す
+collect_ignore_glob = ["test_debug_*.py"]
+
+# no_network フィクスチャで差し替える通信経路
+NETWORK_TARGETS = (
+    "requests.get",
+    "requests.post",
+    "urllib.request.urlopen",
+    "BackcastPro.api.cloud_run_client.CloudRunClient",
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tmpfs_tempdir():
+    """
+    Linux では tempfile の作成先をセッション中だけ tmpfs に切り替える
+
+    tempfile.mkdtemp() で作られるキャッシュディレクトリ（DuckDBファイル等）が
+    ディスクではなくメモリ上に置かれる。tmpfs が使えない環境（Windows/macOS）では
+    何もしない。
+    """
+    if not sys.platform.startswith("linux") or not os.access(TMPFS_DIR, os.W_OK):
+        yield tempfile.gettempdir()
+        return
+
+    base_dir = tempfile.mkdtemp(prefix="backcastpro_tests_", dir=TMPFS_DIR)
+    original_tempdir = tempfile.tempdir
+    tempfile.tempdir = base_dir
+    try:
+        yield base_dir
+    finally:
+        tempfile.tempdir = original_tempdir
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+def _network_disabled(*args, **kwargs):
+    raise RuntimeError("テスト中の外部通信は禁止されています。モックを設定してください。")
+
+
+@pytest.fixture(scope="module")
+def no_network():
+    """
+    モジュール内のテストで実際のHTTP通信が発生しないようにする
+
+    requests / urllib / CloudRunClient を呼び出すと例外を送出する関数に差し替える。
+    通信結果を使うテストは、テスト内でさらに patch して上書きすること。
+    利用側は ``pytestmark = pytest.mark.usefixtures("no_network")`` で有効化する。
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        for target in NETWORK_TARGETS:
+            mp.setattr(target, _network_disabled)
+        yield
+
+
+@pytest.fixture
+def mock_jq():
+    """
+    jquants インスタンスの autospec モック
+
+    メソッド呼び出しは実際の jquants のシグネチャで検証される。
+    テストでは isEnable と、使うメソッドの return_value / side_effect だけを設定する。
+    """
+    from trading_data.lib.jquants import jquants
+
+    return create_autospec(jquants, instance=True)
+
+
+# ---------------------------------------------------------------------------
+# テスト用合成 OHLCV データ（セッションで1度だけ生成）
+#
+# Backtest / NautilusBacktest は受け取った DataFrame をコピーして使うため、
+# 共有しても各テストの状態は独立している。テスト内で直接変更しないこと。
+# 生成関数は (days, start_price) ごとに結果をキャッシュし、初回利用時にだけ計算する。
+# ---------------------------------------------------------------------------
+
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _ohlcv_frame(index, open_, high, low, close, volume) -> pd.DataFrame:
+    """
+    OHLCV の各列を1つの float64 配列にまとめて DataFrame 化する
+
+    列ごとの dict から組み立てるより、単一ブロックの DataFrame をコピーなしで作れる。
+    """
+    values = np.column_stack((open_, high, low, close, volume)).astype(
+        np.float64, copy=False
+    )
+    return pd.DataFrame(values, columns=OHLCV_COLUMNS, index=index, copy=False)
+
+
+@functools.cache
+def create_synthetic_df(days: int = 30, start_price: float = 2500.0) -> pd.DataFrame:
+    """テスト用 OHLCV DataFrame を生成する（営業日・価格は加算ランダムウォーク）"""
+    dates = pd.date_range(start="2024-01-01", periods=days, freq="B")  # 営業日
+    rng = np.random.default_rng(42)
+    # 乱数は1回でまとめて生成する（行: 価格・Open・High・Low）
+    noise = rng.standard_normal((4, days))
+    prices = np.maximum(start_price + np.cumsum(noise[0] * 10), 100)  # 負値防止
+
+    return _ohlcv_frame(
+        dates,
+        prices * (1 + noise[1] * 0.002),
+        prices * (1 + np.abs(noise[2]) * 0.005),
+        prices * (1 - np.abs(noise[3]) * 0.005),
+        prices,
+        rng.integers(1000, 10000, days),
+    )
+
+
+@functools.cache
+def create_small_df(days: int) -> pd.DataFrame:
+    """テスト用 OHLCV DataFrame を生成する（日次・価格は乗算ランダムウォーク）"""
+    dates = pd.date_range("2024-01-01", periods=days, freq="D")
+    rng = np.random.default_rng(42)
+    # 乱数は1回でまとめて生成する（行: リターン・Open・High・Low）
+    noise = rng.standard_normal((4, days))
+    base = 1000
+    prices = base * np.cumprod(1 + noise[0] * 0.02)
+    return _ohlcv_frame(
+        dates,
+        prices * (1 + noise[1] * 0.003),
+        prices * (1 + np.abs(noise[2]) * 0.01),
+        prices * (1 - np.abs(noise[3]) * 0.01),
+        prices,
+        rng.integers(1000, 10000, days),
+    )
+
+
+@functools.cache
+def create_linear_df(days: int) -> pd.DataFrame:
+    """テスト用 OHLCV DataFrame を生成する（日次・価格は線形に上昇、乱数なし）"""
+    dates = pd.date_range("2024-01-01", periods=days, freq="D")
+    prices = np.linspace(1000.0, 1100.0, days)
+    return _ohlcv_frame(
+        dates,
+        prices * 1.003,
+        prices * 1.01,
+        prices * 0.99,
+        prices,
+        np.full(days, 5000.0),
+    )
+
+
+@pytest.fixture(scope="session")
+def synthetic_df_30():
+    """NautilusBacktest テスト用 30 営業日分"""
+    return create_synthetic_df(30)
+
+
+@pytest.fixture(scope="session")
+def linear_df_10():
+    """Trade テスト用 10 日分（goto(5) と数ステップだけ使う。値の符号・正負のみ検証）"""
+    return create_linear_df(10)
+
+
+@pytest.fixture(scope="session")
+def synthetic_df_20_small():
+    """Order テスト用 20 日分"""
+    return create_small_df(20)
+
+
+@pytest.fixture(scope="session")
+def synthetic_df_30_small():
+    """Position テスト用 30 日分"""
+    return create_small_df(30)
+
+
+# ---------------------------------------------------------------------------
+# テスト用株価 DataFrame（Date 列付き、J-Quants / Tachibana / Stooq の取得結果の代わり）
+# ---------------------------------------------------------------------------
+
+
+@functools.cache
+def _price_frame(dates: tuple, close_values: tuple, code: str) -> pd.DataFrame:
+    """Open/High/Low を終値と同値にした株価 DataFrame を生成する"""
+    return pd.DataFrame({
+        "Date": pd.to_datetime(list(dates)),
+        "Open": list(close_values),
+        "High": list(close_values),
+        "Low": list(close_values),
+        "Close": list(close_values),
+        "Volume": [1000] * len(dates),
+        "Code": [code] * len(dates),
+    })
+
+
+@pytest.fixture(scope="session")
+def make_price_df():
+    """
+    テスト用の株価 DataFrame を作るファクトリ
+
+    (dates, close_values, code) ごとに生成結果をキャッシュし、呼び出しごとにコピーを返す
+    （テスト内で変更しても他のテストに影響しない）。
+    """
+    def _make(dates, close_values, code="7203"):
+        return _price_frame(tuple(dates), tuple(close_values), code).copy()
+
+    return _make
@@ -25,18 +25,19 @@ from BackcastPro import Backtest
 def create_sample_df(days: int = 100) -> pd.DataFrame:
     """Create sample OHLC data for testing"""
     dates = pd.date_range(start="2024-01-01", periods=days, freq="D")
-    np.random.seed(42)
+    # Local Generator so the global NumPy RNG state is left untouched
+    rng = np.random.default_rng(42)
 
     base_price = 100
-    returns = np.random.randn(days) * 0.02
+    returns = rng.standard_normal(days) * 0.02
     prices = base_price * np.cumprod(1 + returns)
 
     df = pd.DataFrame({
-        "Open": prices * (1 + np.random.randn(days) * 0.005),
-        "High": prices * (1 + np.abs(np.random.randn(days) * 0.01)),
-        "Low": prices * (1 - np.abs(np.random.randn(days) * 0.01)),
+        "Open": prices * (1 + rng.standard_normal(days) * 0.005),
+        "High": prices * (1 + np.abs(rng.standard_normal(days) * 0.01)),
+        "Low": prices * (1 - np.abs(rng.standard_normal(days) * 0.01)),
         "Close": prices,
-        "Volume": np.random.randint(1000, 10000, days),
+        "Volume": rng.integers(1000, 10000, days),
     }, index=dates)
 
     return df
@@ -234,6 +235,27 @@ class TestGetStateSnapshot:
         assert code in result["positions"] or result["position"] > 0, \
             "Should have position after buy"
 
+    def test_get_state_snapshot_matches_properties(self):
+        """
+        get_state_snapshot() values should match the individual properties.
+        """
+        code = "TEST"
+        df = create_sample_df(10)
+        bt = Backtest(data={code: df}, cash=100000)
+
+        bt.step()
+        bt.buy(code=code, size=10)
+        bt.step()  # Order executes
+
+        result = bt.get_state_snapshot()
+
+        assert result["current_time"] == str(bt.current_time)
+        assert result["equity"] == float(bt.equity)
+        assert result["cash"] == float(bt.cash)
+        assert result["position"] == bt.position.size
+        assert result["positions"] == {code: bt.position_of(code)}
+        assert result["closed_trades"] == len(bt.closed_trades)
+
     def test_get_state_snapshot_closed_trades_count(self):
         """
         get_state_snapshot()['closed_trades'] should be count of closed trades.
@@ -21,18 +21,19 @@ from BackcastPro import Backtest
 def create_sample_df(days: int = 100) -> pd.DataFrame:
     """Create sample OHLC data for testing"""
     dates = pd.date_range(start="2024-01-01", periods=days, freq="D")
-    np.random.seed(42)
+    # Local Generator so the global NumPy RNG state is left untouched
+    rng = np.random.default_rng(42)
 
     base_price = 100
-    returns = np.random.randn(days) * 0.02
+    returns = rng.standard_normal(days) * 0.02
     prices = base_price * np.cumprod(1 + returns)
 
     df = pd.DataFrame({
-        "Open": prices * (1 + np.random.randn(days) * 0.005),
-        "High": prices * (1 + np.abs(np.random.randn(days) * 0.01)),
-        "Low": prices * (1 - np.abs(np.random.randn(days) * 0.01)),
+        "Open": prices * (1 + rng.standard_normal(days) * 0.005),
+        "High": prices * (1 + np.abs(rng.standard_normal(days) * 0.01)),
+        "Low": prices * (1 - np.abs(rng.standard_normal(days) * 0.01)),
         "Close": prices,
-        "Volume": np.random.randint(1000, 10000, days),
+        "Volume": rng.integers(1000, 10000, days),
     }, index=dates)
 
     return df
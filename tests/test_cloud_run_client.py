@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import patch, MagicMock
+import io
 import os
+import shutil
 import sys
 import tempfile
 
@@ -9,6 +11,32 @@ sys.path.insert(0, os.path.abspath("src"))
 from BackcastPro.api.cloud_run_client import CloudRunConfig, CloudRunClient
 
 
+class _UnclosedBytesIO(io.BytesIO):
+    """with ブロックを抜けても getvalue() できる BytesIO"""
+
+    def close(self):
+        pass
+
+
+def _patch_memory_open(buffers):
+    """
+    cloud_run_client 内の open() をメモリ上のバッファに差し替える
+
+    書き込まれた内容はパスをキーとして buffers に保持される。
+    """
+
+    def fake_open(path, mode="r", *args, **kwargs):
+        buffers[path] = _UnclosedBytesIO()
+        return buffers[path]
+
+    return patch("BackcastPro.api.cloud_run_client.open", fake_open, create=True)
+
+
+def _feed_test_content(chunk_size=None):
+    """resp.iter_content() の代わりに固定のチャンクを1つ返す"""
+    return iter((b"test content",))
+
+
 class TestCloudRunConfig(unittest.TestCase):
     def test_from_environment_with_values(self):
         """環境変数から設定を読み込む"""
@@ -49,49 +77,56 @@ class TestCloudRunConfig(unittest.TestCase):
 
 
 class TestCloudRunClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # ダウンロード先の一時ディレクトリはクラスで1つだけ作成
+        cls._tmpdir = tempfile.mkdtemp()
+        # requests.get のモックはクラスで1つだけ作成し、テストごとにリセットする
+        cls._get_patcher = patch("BackcastPro.api.cloud_run_client.requests.get")
+        cls.mock_get = cls._get_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._get_patcher.stop()
+        shutil.rmtree(cls._tmpdir, ignore_errors=True)
+
     def setUp(self):
+        self.mock_get.reset_mock(return_value=True, side_effect=True)
         self.config = CloudRunConfig(api_base_url="https://my-api.run.app")
         self.client = CloudRunClient(self.config)
+        # テストごとに固有のダウンロード先パス（ファイルは作成しない）
+        self.test_path = os.path.join(self._tmpdir, f"{self._testMethodName}.bin")
 
     def test_download_file_success(self):
         """ダウンロード成功（200 OK）"""
         mock_resp = MagicMock()
         mock_resp.status_code = 200
         mock_resp.raise_for_status.return_value = None
-        mock_resp.iter_content.return_value = [b"test content"]
+        mock_resp.iter_content.side_effect = _feed_test_content
 
-        with patch(
-            "BackcastPro.api.cloud_run_client.requests.get", return_value=mock_resp
-        ):
-            with tempfile.NamedTemporaryFile(delete=False) as f:
-                test_path = f.name
-
-            try:
-                result = self.client.download_file(
-                    "stocks_daily/1234.duckdb", test_path
-                )
-                self.assertTrue(result)
-                with open(test_path, "rb") as f:
-                    self.assertEqual(f.read(), b"test content")
-            finally:
-                if os.path.exists(test_path):
-                    os.remove(test_path)
+        buffers = {}
+        self.mock_get.return_value = mock_resp
+        with _patch_memory_open(buffers):
+            result = self.client.download_file(
+                "stocks_daily/1234.duckdb", self.test_path
+            )
+            self.assertTrue(result)
+            self.assertEqual(buffers[self.test_path].getvalue(), b"test content")
 
     def test_download_file_not_found(self):
         """ファイルが存在しない場合（404）"""
         mock_resp = MagicMock()
         mock_resp.status_code = 404
 
-        with patch(
-            "BackcastPro.api.cloud_run_client.requests.get", return_value=mock_resp
-        ):
-            with tempfile.NamedTemporaryFile(delete=False) as f:
-                test_path = f.name
-            os.remove(test_path)
-
-            result = self.client.download_file("stocks_daily/9999.duckdb", test_path)
+        buffers = {}
+        self.mock_get.return_value = mock_resp
+        with _patch_memory_open(buffers):
+            result = self.client.download_file(
+                "stocks_daily/9999.duckdb", self.test_path
+            )
             self.assertFalse(result)
-            self.assertFalse(os.path.exists(test_path))
+            # ファイルは開かれていない
+            self.assertNotIn(self.test_path, buffers)
 
     def test_download_file_server_error(self):
         """サーバーエラー（500）"""
@@ -99,28 +134,15 @@ class TestCloudRunClient(unittest.TestCase):
         mock_resp.status_code = 500
         mock_resp.raise_for_status.side_effect = Exception("500 Server Error")
 
-        with patch(
-            "BackcastPro.api.cloud_run_client.requests.get", return_value=mock_resp
-        ):
-            with tempfile.NamedTemporaryFile(delete=False) as f:
-                test_path = f.name
-            os.remove(test_path)
-
-            result = self.client.download_file("stocks_daily/1234.duckdb", test_path)
-            self.assertFalse(result)
+        self.mock_get.return_value = mock_resp
+        result = self.client.download_file("stocks_daily/1234.duckdb", self.test_path)
+        self.assertFalse(result)
 
     def test_download_file_connection_error(self):
         """接続エラー"""
-        with patch(
-            "BackcastPro.api.cloud_run_client.requests.get",
-            side_effect=Exception("Connection refused"),
-        ):
-            with tempfile.NamedTemporaryFile(delete=False) as f:
-                test_path = f.name
-            os.remove(test_path)
-
-            result = self.client.download_file("stocks_daily/1234.duckdb", test_path)
-            self.assertFalse(result)
+        self.mock_get.side_effect = Exception("Connection refused")
+        result = self.client.download_file("stocks_daily/1234.duckdb", self.test_path)
+        self.assertFalse(result)
 
     def test_download_file_cleans_up_partial_file(self):
         """ダウンロード失敗時に部分ファイルを削除"""
@@ -129,16 +151,14 @@ class TestCloudRunClient(unittest.TestCase):
         mock_resp.raise_for_status.return_value = None
         mock_resp.iter_content.side_effect = Exception("Network interrupted")
 
-        with patch(
-            "BackcastPro.api.cloud_run_client.requests.get", return_value=mock_resp
-        ):
-            with tempfile.NamedTemporaryFile(delete=False) as f:
-                f.write(b"partial data")
-                test_path = f.name
+        self.mock_get.return_value = mock_resp
+        test_path = self.test_path
+        with open(test_path, "wb") as f:
+            f.write(b"partial data")
 
-            result = self.client.download_file("stocks_daily/1234.duckdb", test_path)
-            self.assertFalse(result)
-            self.assertFalse(os.path.exists(test_path))
+        result = self.client.download_file("stocks_daily/1234.duckdb", test_path)
+        self.assertFalse(result)
+        self.assertFalse(os.path.exists(test_path))
 
     def test_download_file_url_construction(self):
         """URLが正しく構築されること"""
@@ -147,22 +167,14 @@ class TestCloudRunClient(unittest.TestCase):
         mock_resp.raise_for_status.return_value = None
         mock_resp.iter_content.return_value = [b"data"]
 
-        with patch(
-            "BackcastPro.api.cloud_run_client.requests.get", return_value=mock_resp
-        ) as mock_get:
-            with tempfile.NamedTemporaryFile(delete=False) as f:
-                test_path = f.name
-
-            try:
-                self.client.download_file("jp/stocks_daily/1234.duckdb", test_path)
-                mock_get.assert_called_once_with(
-                    "https://my-api.run.app/jp/stocks_daily/1234.duckdb",
-                    stream=True,
-                    timeout=(10, 300),
-                )
-            finally:
-                if os.path.exists(test_path):
-                    os.remove(test_path)
+        self.mock_get.return_value = mock_resp
+        with _patch_memory_open({}):
+            self.client.download_file("jp/stocks_daily/1234.duckdb", self.test_path)
+            self.mock_get.assert_called_once_with(
+                "https://my-api.run.app/jp/stocks_daily/1234.duckdb",
+                stream=True,
+                timeout=(10, 300),
+            )
 
     def test_download_file_url_trailing_slash(self):
         """ベースURLの末尾スラッシュが正しく処理されること"""
@@ -174,49 +186,41 @@ class TestCloudRunClient(unittest.TestCase):
         mock_resp.raise_for_status.return_value = None
         mock_resp.iter_content.return_value = [b"data"]
 
-        with patch(
-            "BackcastPro.api.cloud_run_client.requests.get", return_value=mock_resp
-        ) as mock_get:
-            with tempfile.NamedTemporaryFile(delete=False) as f:
-                test_path = f.name
-
-            try:
-                client.download_file("jp/listed_info.duckdb", test_path)
-                mock_get.assert_called_once_with(
-                    "https://my-api.run.app/jp/listed_info.duckdb",
-                    stream=True,
-                    timeout=(10, 300),
-                )
-            finally:
-                if os.path.exists(test_path):
-                    os.remove(test_path)
-
-    def test_download_stocks_daily(self):
-        """download_stocks_daily便利メソッド"""
-        with patch.object(self.client, "download_file", return_value=True) as mock_dl:
-            result = self.client.download_stocks_daily("1234", "/local/1234.duckdb")
-            self.assertTrue(result)
-            mock_dl.assert_called_once_with(
-                "jp/stocks_daily/1234.duckdb", "/local/1234.duckdb"
-            )
-
-    def test_download_stocks_board(self):
-        """download_stocks_board便利メソッド"""
-        with patch.object(self.client, "download_file", return_value=True) as mock_dl:
-            result = self.client.download_stocks_board("1234", "/local/1234.duckdb")
-            self.assertTrue(result)
-            mock_dl.assert_called_once_with(
-                "jp/stocks_board/1234.duckdb", "/local/1234.duckdb"
+        self.mock_get.return_value = mock_resp
+        with _patch_memory_open({}):
+            client.download_file("jp/listed_info.duckdb", self.test_path)
+            self.mock_get.assert_called_once_with(
+                "https://my-api.run.app/jp/listed_info.duckdb",
+                stream=True,
+                timeout=(10, 300),
             )
 
-    def test_download_listed_info(self):
-        """download_listed_info便利メソッド"""
+    def test_convenience_methods_delegate_to_download_file(self):
+        """便利メソッドがリモートパスを組み立てて download_file に委譲すること"""
+        cases = [
+            (
+                "download_stocks_daily",
+                ("1234", "/local/1234.duckdb"),
+                "jp/stocks_daily/1234.duckdb",
+            ),
+            (
+                "download_stocks_board",
+                ("1234", "/local/1234.duckdb"),
+                "jp/stocks_board/1234.duckdb",
+            ),
+            (
+                "download_listed_info",
+                ("/local/listed_info.duckdb",),
+                "jp/listed_info.duckdb",
+            ),
+        ]
         with patch.object(self.client, "download_file", return_value=True) as mock_dl:
-            result = self.client.download_listed_info("/local/listed_info.duckdb")
-            self.assertTrue(result)
-            mock_dl.assert_called_once_with(
-                "jp/listed_info.duckdb", "/local/listed_info.duckdb"
-            )
+            for method, args, remote_path in cases:
+                with self.subTest(method=method):
+                    mock_dl.reset_mock()
+                    result = getattr(self.client, method)(*args)
+                    self.assertTrue(result)
+                    mock_dl.assert_called_once_with(remote_path, args[-1])
 
 
 if __name__ == "__main__":
@@ -4,8 +4,10 @@ import os
 import shutil
 import tempfile
 import pandas as pd
+import pytest
 import duckdb
 import sys
+from contextlib import contextmanager
 from datetime import datetime
 
 # Ensure src is in pythonpath
@@ -13,26 +15,49 @@ sys.path.insert(0, os.path.abspath("src"))
 
 from BackcastPro.api.db_manager import db_manager
 
+# Shared read-only fixtures; the code under test never mutates its input frames
+_DF_BASIC = pd.DataFrame({"col1": [1, 2], "col2": ["a", "b"], "col3": [1.1, 2.2]})
+_DF_RANGE10 = pd.DataFrame({"id": range(10), "val": range(10)})
+
+# Block real HTTP (requests/urllib/CloudRunClient) for every test in this module
+pytestmark = pytest.mark.usefixtures("no_network")
+
 
 class TestDbManager(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory for the cache
-        self.test_dir = tempfile.mkdtemp()
-        os.environ["STOCKDATA_CACHE_DIR"] = self.test_dir
-        self.db_manager = db_manager()
+    @classmethod
+    def setUpClass(cls):
+        # Create a temporary directory for the cache, shared by the whole class
+        # (per-process prefix keeps pytest-xdist workers apart)
+        cls.test_dir = tempfile.mkdtemp(prefix=f"bc_{os.getpid()}_")
+        os.environ["STOCKDATA_CACHE_DIR"] = cls.test_dir
+        cls.db_manager = db_manager()
         # Mock cloud download to prevent real HTTP requests during tests
-        self._download_patcher = patch.object(
+        cls._download_patcher = patch.object(
             db_manager, "_download_from_cloud", return_value=False
         )
-        self._download_patcher.start()
+        cls._download_patcher.start()
 
-    def tearDown(self):
-        self._download_patcher.stop()
-        # Remove the temporary directory after the test
-        shutil.rmtree(self.test_dir)
+    @classmethod
+    def tearDownClass(cls):
+        cls._download_patcher.stop()
+        # Remove the temporary directory after the last test
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
         if "STOCKDATA_CACHE_DIR" in os.environ:
             del os.environ["STOCKDATA_CACHE_DIR"]
 
+    def setUp(self):
+        # Tests set _db_subdir on the shared instance; restore the class default
+        self.addCleanup(vars(self.db_manager).pop, "_db_subdir", None)
+
+    @contextmanager
+    def _get_mem_db(self):
+        """Yield an in-memory DuckDB connection for tests that do not need a file."""
+        db = duckdb.connect(":memory:")
+        try:
+            yield db
+        finally:
+            db.close()
+
     def test_init_creates_cache_dir(self):
         """Test that the cache directory is created upon initialization."""
         self.assertTrue(os.path.exists(self.test_dir))
@@ -53,8 +78,9 @@ class TestDbManager(unittest.TestCase):
     @patch("BackcastPro.api.cloud_run_client.CloudRunClient")
     def test_get_db_downloads_from_cloud(self, MockCloudRunClient):
         """Test that get_db tries to download from cloud if local file is missing."""
-        # Stop the setUp-level mock so the real _download_from_cloud runs
+        # Stop the class-level mock (setUpClass) so the real _download_from_cloud runs
         self._download_patcher.stop()
+        self.addCleanup(self._download_patcher.start)
 
         code = "5678"
         self.db_manager._db_subdir = "test_subdir"
@@ -75,19 +101,11 @@ class TestDbManager(unittest.TestCase):
         # Verify download was attempted
         mock_client_instance.download_file.assert_called_once()
 
-        # Re-start the setUp-level mock for tearDown
-        self._download_patcher.start()
-
     def test_create_table_from_dataframe(self):
         """Test creating a table from a DataFrame."""
-        code = "9999"
-        self.db_manager._db_subdir = "test_subdir"
-
-        df = pd.DataFrame({"col1": [1, 2], "col2": ["a", "b"], "col3": [1.1, 2.2]})
-
-        with self.db_manager.get_db(code) as db:
+        with self._get_mem_db() as db:
             self.db_manager._create_table_from_dataframe(
-                db, "test_table", df, primary_keys=["col1"]
+                db, "test_table", _DF_BASIC, primary_keys=["col1"]
             )
 
             # Verify table exists
@@ -95,8 +113,8 @@ class TestDbManager(unittest.TestCase):
             self.assertEqual(result[0], 0)  # Table created but empty
 
             # Verify schema
-            columns = db.execute("PRAGMA table_info(test_table)").fetchdf()
-            col_names = columns["name"].tolist()
+            rows = db.execute("PRAGMA table_info(test_table)").fetchall()
+            col_names = [row[1] for row in rows]
             self.assertIn("col1", col_names)
             self.assertIn("col2", col_names)
             self.assertIn("col3", col_names)
@@ -104,37 +122,36 @@ class TestDbManager(unittest.TestCase):
 
     def test_validate_table_schema(self):
         """Test schema validation."""
-        code = "8888"
-        self.db_manager._db_subdir = "test_subdir"
+        df = _DF_BASIC[["col1", "col2"]]
 
-        df = pd.DataFrame({"col1": [1], "col2": ["a"]})
-
-        with self.db_manager.get_db(code) as db:
+        with self._get_mem_db() as db:
             self.db_manager._create_table_from_dataframe(db, "test_table", df)
 
-            # Case 1: Matching schema (should pass)
-            self.db_manager._validate_table_schema(db, "test_table", df, "col1")
+            with self.subTest(case="matching schema"):
+                # Should pass
+                self.db_manager._validate_table_schema(db, "test_table", df, "col1")
 
-            # Case 2: Missing column in new data (should log warning but pass if key exists)
-            df_missing = pd.DataFrame({"col1": [2]})  # col2 missing
-            self.db_manager._validate_table_schema(db, "test_table", df_missing, "col1")
-
-            # Case 3: Missing key column (should raise ValueError)
-            df_no_key = pd.DataFrame({"col2": ["b"]})  # col1 (key) missing
-            with self.assertRaises(ValueError):
+            with self.subTest(case="missing column"):
+                # col2 missing: should log warning but pass if key exists
+                df_missing = df[["col1"]].head(1)
                 self.db_manager._validate_table_schema(
-                    db, "test_table", df_no_key, "col1"
+                    db, "test_table", df_missing, "col1"
                 )
 
+            with self.subTest(case="missing key column"):
+                # col1 (key) missing: should raise ValueError
+                df_no_key = df[["col2"]].head(1)
+                with self.assertRaises(ValueError):
+                    self.db_manager._validate_table_schema(
+                        db, "test_table", df_no_key, "col1"
+                    )
+
     def test_batch_insert_data(self):
         """Test batch insertion."""
-        code = "7777"
-        self.db_manager._db_subdir = "test_subdir"
+        # Use a df larger than the batch size (simulating small batch for test)
+        df = _DF_RANGE10
 
-        # Create a df larger than default batch size (simulating small batch for test)
-        df = pd.DataFrame({"id": range(10), "val": range(10)})
-
-        with self.db_manager.get_db(code) as db:
+        with self._get_mem_db() as db:
             self.db_manager._create_table_from_dataframe(db, "test_table", df)
 
             # Insert with small batch size
@@ -143,15 +160,181 @@ class TestDbManager(unittest.TestCase):
             count = db.execute("SELECT COUNT(*) FROM test_table").fetchone()[0]
             self.assertEqual(count, 10)
 
+    def test_batch_insert_data_uses_appender_without_constraints(self):
+        """Test that tables without a PK/UNIQUE constraint are loaded via append."""
+        with self._get_mem_db() as db:
+            self.db_manager._create_table_from_dataframe(db, "test_table", _DF_RANGE10)
+
+            with patch.object(
+                self.db_manager, "_insert_chunk", wraps=self.db_manager._insert_chunk
+            ) as mock_insert:
+                self.db_manager._batch_insert_data(
+                    db, "test_table", _DF_RANGE10, batch_size=3
+                )
+
+            self.assertEqual(mock_insert.call_count, 4)
+            for call in mock_insert.call_args_list:
+                # append_plan is passed, so the chunk goes through the appender
+                self.assertIsNotNone(call.args[-1])
+
+            # Metadata columns are filled from their defaults
+            null_count = db.execute(
+                "SELECT COUNT(*) FROM test_table WHERE created_at IS NULL"
+            ).fetchone()[0]
+            self.assertEqual(null_count, 0)
+
+    def test_batch_insert_data_appender_reorders_columns(self):
+        """Test that append matches columns by name without append(by_name=True)."""
+        with self._get_mem_db() as db:
+            self.db_manager._create_table_from_dataframe(db, "test_table", _DF_RANGE10)
+            reordered = pd.DataFrame({"val": [100, 101], "id": [0, 1]})
+
+            self.db_manager._batch_insert_data(db, "test_table", reordered)
+
+            rows = db.execute(
+                "SELECT id, val FROM test_table ORDER BY id"
+            ).fetchall()
+            self.assertEqual(rows, [(0, 100), (1, 101)])
+
+    def test_batch_insert_data_appender_matches_columns_case_insensitively(self):
+        """Test that append maps df columns to table columns like INSERT does."""
+        with self._get_mem_db() as db:
+            db.execute('CREATE TABLE test_table ("Close" DOUBLE)')
+
+            self.db_manager._batch_insert_data(
+                db, "test_table", pd.DataFrame({"close": [1.5, 2.5]})
+            )
+
+            rows = db.execute('SELECT "Close" FROM test_table').fetchall()
+            self.assertEqual(rows, [(1.5,), (2.5,)])
+
+    def test_batch_insert_data_appender_rejects_unknown_columns(self):
+        """Test that a df column missing from the table raises instead of being dropped."""
+        with self._get_mem_db() as db:
+            db.execute("CREATE TABLE test_table (id BIGINT)")
+
+            with self.assertRaises(ValueError):
+                self.db_manager._batch_insert_data(
+                    db, "test_table", pd.DataFrame({"id": [1], "extra": [2]})
+                )
+
+    def test_batch_insert_data_volatile_default_uses_insert(self):
+        """Test that per-row defaults such as nextval() are not copied across rows."""
+        with self._get_mem_db() as db:
+            db.execute("CREATE SEQUENCE seq")
+            db.execute(
+                "CREATE TABLE test_table (id BIGINT DEFAULT nextval('seq'), val BIGINT)"
+            )
+
+            self.db_manager._batch_insert_data(
+                db, "test_table", _DF_RANGE10[["val"]], batch_size=3
+            )
+
+            ids = db.execute("SELECT id FROM test_table ORDER BY id").fetchall()
+            self.assertEqual(ids, [(i,) for i in range(1, 11)])
+
+    def test_batch_insert_data_resolves_append_plan_once(self):
+        """Test that the column mapping and defaults are resolved once per call."""
+        with self._get_mem_db() as db:
+            self.db_manager._create_table_from_dataframe(db, "test_table", _DF_RANGE10)
+
+            with patch.object(
+                self.db_manager,
+                "_resolve_append_plan",
+                wraps=self.db_manager._resolve_append_plan,
+            ) as mock_resolve:
+                self.db_manager._batch_insert_data(
+                    db, "test_table", _DF_RANGE10, batch_size=3
+                )
+
+            mock_resolve.assert_called_once()
+
+    def test_batch_insert_data_appends_initial_load_with_primary_key(self):
+        """Test that the first load into an empty PK table uses append."""
+        with self._get_mem_db() as db:
+            self.db_manager._create_table_from_dataframe(
+                db, "test_table", _DF_RANGE10, primary_keys=["id"]
+            )
+
+            self.assertTrue(
+                self.db_manager._can_append_without_conflict(
+                    db, "test_table", _DF_RANGE10
+                )
+            )
+            # Duplicate keys inside the new data still need ON CONFLICT
+            self.assertFalse(
+                self.db_manager._can_append_without_conflict(
+                    db, "test_table", pd.concat([_DF_RANGE10, _DF_RANGE10])
+                )
+            )
+
+            self.db_manager._batch_insert_data(db, "test_table", _DF_RANGE10)
+            # Existing rows may conflict with new data
+            self.assertFalse(
+                self.db_manager._can_append_without_conflict(
+                    db, "test_table", _DF_RANGE10
+                )
+            )
+
+    def test_get_unique_constraints_ignores_other_schemas(self):
+        """Test that a same-named table in another schema does not leak its keys."""
+        with self._get_mem_db() as db:
+            db.execute("CREATE SCHEMA other")
+            db.execute("CREATE TABLE other.test_table (id BIGINT PRIMARY KEY)")
+            db.execute("CREATE TABLE test_table (id BIGINT)")
+
+            self.assertEqual(
+                self.db_manager._get_unique_constraints(db, "test_table"), []
+            )
+
+    def test_add_db_reuses_table_info(self):
+        """Test that __add_db__ reads PRAGMA table_info once for validate and insert."""
+        with self._get_mem_db() as db:
+            self.db_manager._create_table_from_dataframe(db, "test_table", _DF_RANGE10)
+            recorder = MagicMock(wraps=db)
+
+            self.db_manager.__add_db__(recorder, "test_table", _DF_RANGE10, "id")
+
+            pragmas = [
+                call
+                for call in recorder.execute.call_args_list
+                if call.args[0].startswith("PRAGMA table_info")
+            ]
+            self.assertEqual(len(pragmas), 1)
+            count = db.execute("SELECT COUNT(*) FROM test_table").fetchone()[0]
+            self.assertEqual(count, 10)
+
+    def test_can_append_without_conflict_when_constraints_unknown(self):
+        """Test that a failed constraint lookup falls back to ON CONFLICT."""
+        db = MagicMock()
+        db.execute.side_effect = duckdb.Error("lookup failed")
+
+        self.assertIsNone(self.db_manager._get_unique_constraints(db, "test_table"))
+        self.assertFalse(
+            self.db_manager._can_append_without_conflict(db, "test_table", _DF_RANGE10)
+        )
+
+    def test_batch_insert_data_skips_conflicts_with_primary_key(self):
+        """Test that batch insertion into a PK table ignores duplicate keys."""
+        with self._get_mem_db() as db:
+            self.db_manager._create_table_from_dataframe(
+                db, "test_table", _DF_RANGE10, primary_keys=["id"]
+            )
+
+            for _ in range(2):
+                self.db_manager._batch_insert_data(
+                    db, "test_table", _DF_RANGE10, batch_size=3
+                )
+
+            count = db.execute("SELECT COUNT(*) FROM test_table").fetchone()[0]
+            self.assertEqual(count, 10)
+
     def test_add_db_deduplication(self):
         """Test that __add_db__ deduplicates based on key."""
-        code = "6666"
-        self.db_manager._db_subdir = "test_subdir"
-
         # Initial data
         df1 = pd.DataFrame({"id": [1, 2], "val": ["a", "b"]})
 
-        with self.db_manager.get_db(code) as db:
+        with self._get_mem_db() as db:
             self.db_manager.__create_db__(db, "test_table", df1, "id")
 
             # Add intersecting data
@@ -159,13 +342,14 @@ class TestDbManager(unittest.TestCase):
             self.db_manager.__add_db__(db, "test_table", df2, "id")
 
             # Check results
-            result = db.execute("SELECT * FROM test_table ORDER BY id").fetchdf()
-            self.assertEqual(len(result), 3)
+            count = db.execute("SELECT COUNT(*) FROM test_table").fetchone()[0]
+            self.assertEqual(count, 3)
             # id=2 should presumably NOT be updated if logic waits for unique new keys
             # logic in __add_db__: unique_disclosure_numbers = new - existing
             # so id=2 is in existing, so it is skipped.
-            self.assertEqual(result.loc[result["id"] == 2, "val"].iloc[0], "b")
-            self.assertEqual(result.loc[result["id"] == 3, "val"].iloc[0], "c")
+            val_sql = "SELECT val FROM test_table WHERE id = ?"
+            self.assertEqual(db.execute(val_sql, [2]).fetchone()[0], "b")
+            self.assertEqual(db.execute(val_sql, [3]).fetchone()[0], "c")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
 import pytest
+import numpy as np
 import pandas as pd
 import os
-import tempfile
 import shutil
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 import sys
@@ -11,49 +12,120 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 from BackcastPro.api.db_stocks_board import db_stocks_board
 
+# テストで使うタイムスタンプ（2024-01-01 08:00〜09:29 の1分足）を1度だけ生成してスライスする
+_TS_BASE = pd.date_range(start="2024-01-01 08:00:00", periods=90, freq="1min")
+_TS_0800 = _TS_BASE[:60]
+_TS_0900 = _TS_BASE[60:]
+
+
+def _assert_datetime_column(series):
+    """読み込んだTimestamp列が変換不要なdatetime64型であることを確認"""
+    assert series.dtype.kind == "M"
+
 
 @pytest.fixture
-def temp_cache_dir():
-    """テスト用の一時キャッシュディレクトリを作成"""
-    temp_dir = tempfile.mkdtemp()
+def temp_cache_dir(tmp_path_factory):
+    """テスト用の一時キャッシュディレクトリを作成（pytest-xdistのワーカーごとに分離）"""
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    temp_dir = str(tmp_path_factory.mktemp(f"cache_{worker_id}"))
     yield temp_dir
     # テスト終了後にクリーンアップ
     shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+# テスト用DB接続の設定（クラッシュ耐性は不要なため終了時のチェックポイント書き込みを省く）
+TEST_DB_PRAGMAS = (
+    "PRAGMA disable_checkpoint_on_shutdown",
+    "SET threads = 1",
+)
+
+
+def _with_test_pragmas(get_db):
+    """get_dbをラップし、接続ごとにTEST_DB_PRAGMASを適用する"""
+
+    @contextmanager
+    def wrapper(code=None):
+        with get_db(code) as db:
+            for pragma in TEST_DB_PRAGMAS:
+                db.execute(pragma)
+            yield db
+
+    return wrapper
+
+
 @pytest.fixture
 def db_board(temp_cache_dir):
     """テスト用のdb_stocks_boardインスタンスを作成"""
     with patch.dict(os.environ, {"STOCKDATA_CACHE_DIR": temp_cache_dir}):
         instance = db_stocks_board()
         instance.isEnable = True  # 強制的に有効化
+        instance.get_db = _with_test_pragmas(instance.get_db)
         # Mock cloud download to prevent real HTTP requests during tests
         with patch.object(type(instance), "_download_from_cloud", return_value=False):
             yield instance
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_board_data():
-    """サンプルの板情報データを作成"""
-    timestamps = pd.date_range(start="2024-01-01 09:00:00", periods=10, freq="1min")
+    """サンプルの板情報データを作成（セッション内で共有するため変更しないこと）"""
+    timestamps = _TS_0900[:10]
     data = {
         "Timestamp": timestamps,
-        "BidPrice1": [100.0 + i for i in range(10)],
-        "BidVolume1": [1000 + i * 10 for i in range(10)],
-        "AskPrice1": [101.0 + i for i in range(10)],
-        "AskVolume1": [900 + i * 10 for i in range(10)],
+        "BidPrice1": np.arange(10, dtype=float) + 100.0,
+        "BidVolume1": np.arange(10) * 10 + 1000,
+        "AskPrice1": np.arange(10, dtype=float) + 101.0,
+        "AskVolume1": np.arange(10) * 10 + 900,
     }
     return pd.DataFrame(data)
 
 
+@pytest.fixture(scope="session")
+def prepopulated_board(tmp_path_factory, sample_board_data):
+    """
+    sample_board_dataを銘柄コード1234で保存済みのDBファイルを1度だけ作成
+
+    Returns:
+        (DBファイルパス, 保存直後のメタデータ) のタプル
+    """
+    cache_dir = str(tmp_path_factory.mktemp("prepopulated_board"))
+    with patch.dict(os.environ, {"STOCKDATA_CACHE_DIR": cache_dir}):
+        instance = db_stocks_board()
+        with patch.object(db_stocks_board, "_download_from_cloud", return_value=False):
+            instance.save_stock_board("1234", sample_board_data)
+            with instance.get_db("1234") as db:
+                metadata = instance._get_metadata(db, "1234")
+    return instance._get_db_path("1234"), metadata
+
+
+@pytest.fixture(scope="session")
+def prepopulated_db_file(prepopulated_board):
+    """保存済みDBファイルのパス"""
+    return prepopulated_board[0]
+
+
+@pytest.fixture(scope="session")
+def prepopulated_metadata(prepopulated_board):
+    """保存済みDBファイルのメタデータ（セッション内で1度だけ読み込む）"""
+    return prepopulated_board[1]
+
+
+@pytest.fixture
+def populated_db_board(db_board, prepopulated_db_file):
+    """保存済みDBファイルのコピーを参照するdb_stocks_boardインスタンス（変更はテスト内に閉じる）"""
+    db_path = db_board._get_db_path("1234")
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    shutil.copy2(prepopulated_db_file, db_path)
+    return db_board
+
+
 @pytest.fixture
 def sample_board_data_from_api():
     """実際のAPIレスポンスと同じ構造のサンプル板情報データを作成（小文字のcodeカラムを含む）"""
-    timestamps = pd.date_range(start="2024-01-01 09:00:00", periods=10, freq="1min")
+    timestamps = _TS_0900[:10]
     data = {
         "Timestamp": timestamps,
-        "Price": [100.0 + i for i in range(10)],
-        "Qty": [1000 + i * 10 for i in range(10)],
+        "Price": np.arange(10, dtype=float) + 100.0,
+        "Qty": np.arange(10) * 10 + 1000,
         "Type": ["Bid"] * 5 + ["Ask"] * 5,
         "source": ["kabu-station"] * 10,
         "code": ["1234"] * 10,  # 小文字のcodeカラム（APIからのレスポンス形式）
@@ -84,6 +156,7 @@ class TestDbStocksBoard:
         assert len(loaded_df) == len(sample_board_data)
         assert "Code" in loaded_df.columns
         assert "Timestamp" in loaded_df.columns
+        _assert_datetime_column(loaded_df["Timestamp"])
         assert all(loaded_df["Code"] == code)
 
     def test_save_stock_board_empty_dataframe(self, db_board):
@@ -119,10 +192,10 @@ class TestDbStocksBoard:
     def test_save_stock_board_with_timestamp_index(self, db_board):
         """Timestampがインデックスになっている場合のテスト"""
         code = "1234"
-        timestamps = pd.date_range(start="2024-01-01 09:00:00", periods=5, freq="1min")
+        timestamps = _TS_0900[:5]
         data = {
-            "BidPrice1": [100.0 + i for i in range(5)],
-            "BidVolume1": [1000 + i * 10 for i in range(5)],
+            "BidPrice1": np.arange(5, dtype=float) + 100.0,
+            "BidVolume1": np.arange(5) * 10 + 1000,
         }
         df = pd.DataFrame(data, index=timestamps)
         df.index.name = "Timestamp"
@@ -135,12 +208,14 @@ class TestDbStocksBoard:
         # Timestampインデックスが正しくカラムに変換され、5行すべてが保存される
         assert len(loaded_df) == 5
 
-    def test_save_stock_board_duplicate_data(self, db_board, sample_board_data):
+    def test_save_stock_board_duplicate_data(
+        self, populated_db_board, sample_board_data
+    ):
         """重複データの処理テスト"""
+        db_board = populated_db_board
         code = "1234"
 
-        # 最初に保存
-        db_board.save_stock_board(code, sample_board_data)
+        # 保存済みの件数
         loaded_df_1 = db_board.load_stock_board_from_cache(code)
         count_1 = len(loaded_df_1)
 
@@ -152,24 +227,22 @@ class TestDbStocksBoard:
         # 重複データは保存されないため、件数は変わらない
         assert count_1 == count_2
 
-    def test_save_stock_board_append_new_data(self, db_board, sample_board_data):
+    def test_save_stock_board_append_new_data(self, populated_db_board):
         """新しいデータの追加テスト"""
+        db_board = populated_db_board
         code = "1234"
 
-        # 最初のデータを保存
-        db_board.save_stock_board(code, sample_board_data)
+        # 保存済みの件数
         count_1 = len(db_board.load_stock_board_from_cache(code))
 
         # 新しいタイムスタンプのデータを作成
-        new_timestamps = pd.date_range(
-            start="2024-01-01 09:20:00", periods=5, freq="1min"
-        )
+        new_timestamps = _TS_0900[20:25]
         new_data = {
             "Timestamp": new_timestamps,
-            "BidPrice1": [110.0 + i for i in range(5)],
-            "BidVolume1": [1100 + i * 10 for i in range(5)],
-            "AskPrice1": [111.0 + i for i in range(5)],
-            "AskVolume1": [1000 + i * 10 for i in range(5)],
+            "BidPrice1": np.arange(5, dtype=float) + 110.0,
+            "BidVolume1": np.arange(5) * 10 + 1100,
+            "AskPrice1": np.arange(5, dtype=float) + 111.0,
+            "AskVolume1": np.arange(5) * 10 + 1000,
         }
         new_df = pd.DataFrame(new_data)
 
@@ -180,13 +253,13 @@ class TestDbStocksBoard:
         # データが追加されたことを確認
         assert count_2 == count_1 + len(new_df)
 
-    def test_load_stock_board_with_date_range(self, db_board, sample_board_data):
+    def test_load_stock_board_with_date_range(
+        self, populated_db_board, sample_board_data
+    ):
         """日付範囲指定での読み込みテスト"""
+        db_board = populated_db_board
         code = "1234"
 
-        # データを保存
-        db_board.save_stock_board(code, sample_board_data)
-
         # 日付範囲を指定して読み込み
         from_dt = datetime(2024, 1, 1, 9, 3, 0)
         to_dt = datetime(2024, 1, 1, 9, 6, 0)
@@ -198,9 +271,10 @@ class TestDbStocksBoard:
         assert len(loaded_df) < len(sample_board_data)
 
         # タイムスタンプが範囲内であることを確認
-        loaded_df["Timestamp"] = pd.to_datetime(loaded_df["Timestamp"])
-        assert all(loaded_df["Timestamp"] >= from_dt)
-        assert all(loaded_df["Timestamp"] <= to_dt)
+        ts = loaded_df["Timestamp"]
+        _assert_datetime_column(ts)
+        assert ts.min() >= from_dt
+        assert ts.max() <= to_dt
 
     def test_load_stock_board_nonexistent_code(self, db_board):
         """存在しない銘柄コードの読み込みテスト"""
@@ -210,16 +284,12 @@ class TestDbStocksBoard:
         loaded_df = db_board.load_stock_board_from_cache(code)
         assert loaded_df.empty
 
-    def test_metadata_save_and_load(self, db_board, sample_board_data):
+    def test_metadata_save_and_load(self, prepopulated_metadata, sample_board_data):
         """メタデータの保存と読み込みテスト"""
         code = "1234"
 
-        # データを保存（メタデータも自動的に保存される）
-        db_board.save_stock_board(code, sample_board_data)
-
-        # メタデータを取得
-        with db_board.get_db(code) as db:
-            metadata = db_board._get_metadata(db, code)
+        # 保存時にメタデータも自動的に保存されている
+        metadata = prepopulated_metadata
 
         assert metadata is not None
         assert metadata["code"] == code
@@ -227,26 +297,21 @@ class TestDbStocksBoard:
         assert metadata["to_timestamp"] is not None
         assert metadata["record_count"] == len(sample_board_data)
 
-    def test_metadata_update_on_append(self, db_board, sample_board_data):
+    def test_metadata_update_on_append(self, populated_db_board, prepopulated_metadata):
         """データ追加時のメタデータ更新テスト"""
+        db_board = populated_db_board
         code = "1234"
 
-        # 最初のデータを保存
-        db_board.save_stock_board(code, sample_board_data)
-
-        with db_board.get_db(code) as db:
-            metadata_1 = db_board._get_metadata(db, code)
+        metadata_1 = prepopulated_metadata
 
         # 新しいデータを追加（より古い時刻）
-        old_timestamps = pd.date_range(
-            start="2024-01-01 08:00:00", periods=5, freq="1min"
-        )
+        old_timestamps = _TS_0800[:5]
         old_data = {
             "Timestamp": old_timestamps,
-            "BidPrice1": [90.0 + i for i in range(5)],
-            "BidVolume1": [900 + i * 10 for i in range(5)],
-            "AskPrice1": [91.0 + i for i in range(5)],
-            "AskVolume1": [800 + i * 10 for i in range(5)],
+            "BidPrice1": np.arange(5, dtype=float) + 90.0,
+            "BidVolume1": np.arange(5) * 10 + 900,
+            "AskPrice1": np.arange(5, dtype=float) + 91.0,
+            "AskVolume1": np.arange(5) * 10 + 800,
         }
         old_df = pd.DataFrame(old_data)
 
@@ -349,13 +414,11 @@ class TestDbStocksBoard:
         # フォールバック機能により、1234のDBファイルが参照される
         assert len(loaded_df) == len(sample_board_data)
 
-    def test_load_with_string_datetime(self, db_board, sample_board_data):
+    def test_load_with_string_datetime(self, populated_db_board):
         """文字列形式のdatetimeでの読み込みテスト"""
+        db_board = populated_db_board
         code = "1234"
 
-        # データを保存
-        db_board.save_stock_board(code, sample_board_data)
-
         # 文字列形式で日付範囲を指定
         from_str = "2024-01-01 09:03:00"
         to_str = "2024-01-01 09:06:00"
@@ -367,6 +430,52 @@ class TestDbStocksBoard:
         # データが正しく読み込まれることを確認
         assert len(loaded_df) > 0
 
+    def test_load_keeps_offset_and_invalid_timestamps(self, db_board):
+        """オフセット付きや解釈できないTimestampがあっても行を落とさないことを確認"""
+        code = "1234"
+        with db_board.get_db(code) as db:
+            db.execute(
+                'CREATE TABLE stocks_board ("Code" VARCHAR, "Timestamp" VARCHAR, "BidPrice1" DOUBLE)'
+            )
+            db.execute(
+                "INSERT INTO stocks_board VALUES "
+                "('1234', '2024-01-01 09:00:00+09:00', 100.0), "
+                "('1234', 'invalid', 101.0)"
+            )
+
+        loaded_df = db_board.load_stock_board_from_cache(code)
+
+        assert len(loaded_df) == 2
+        _assert_datetime_column(loaded_df["Timestamp"])
+        assert loaded_df["Timestamp"].iloc[0] == pd.Timestamp("2024-01-01 09:00:00+09:00")
+        assert pd.isna(loaded_df["Timestamp"].iloc[1])
+
+    def test_load_mixed_offsets_and_invalid_timestamps(self, db_board):
+        """オフセットの有無・異なるオフセット・不正値が混在しても全行を読み込めることを確認"""
+        code = "1234"
+        with db_board.get_db(code) as db:
+            db.execute(
+                'CREATE TABLE stocks_board ("Code" VARCHAR, "Timestamp" VARCHAR, "BidPrice1" DOUBLE)'
+            )
+            db.execute(
+                "INSERT INTO stocks_board VALUES "
+                "('1234', '2024-01-01 09:00:00', 100.0), "
+                "('1234', '2024-01-01 09:01:00+09:00', 101.0), "
+                "('1234', '2024-01-01 00:02:00+00:00', 102.0), "
+                "('1234', 'invalid', 103.0)"
+            )
+
+        loaded_df = db_board.load_stock_board_from_cache(code)
+
+        assert len(loaded_df) == 4
+        _assert_datetime_column(loaded_df["Timestamp"])
+        assert loaded_df["Timestamp"].dt.tz is None
+        ts = loaded_df.set_index("BidPrice1")["Timestamp"]
+        assert ts[100.0] == pd.Timestamp("2024-01-01 09:00:00")
+        assert ts[101.0] == pd.Timestamp("2024-01-01 09:01:00")
+        assert ts[102.0] == pd.Timestamp("2024-01-01 09:02:00")
+        assert pd.isna(ts[103.0])
+
     def test_concurrent_save_same_code(self, db_board, sample_board_data):
         """同じ銘柄コードへの連続保存テスト（トランザクション確認）"""
         code = "1234"
@@ -379,6 +488,42 @@ class TestDbStocksBoard:
         loaded_df = db_board.load_stock_board_from_cache(code)
         assert len(loaded_df) == len(sample_board_data)
 
+    def test_save_stock_board_many(self, db_board, sample_board_data):
+        """複数DataFrameの一括保存テスト（DB接続は1回）"""
+        code = "1234"
+
+        with patch.object(db_board, "get_db", wraps=db_board.get_db) as mock_get_db:
+            db_board.save_stock_board_many(
+                code, [sample_board_data.iloc[:5], sample_board_data.iloc[5:]]
+            )
+
+        assert mock_get_db.call_count == 1
+
+        # 全データが保存されていることを確認
+        loaded_df = db_board.load_stock_board_from_cache(code)
+        assert len(loaded_df) == len(sample_board_data)
+
+    def test_save_stock_board_many_mixed_timestamp_index(self, db_board, sample_board_data):
+        """Timestampインデックスのデータとカラムのデータを混ぜても時刻が失われないことを確認"""
+        code = "1234"
+        indexed = sample_board_data.iloc[:5].set_index("Timestamp")
+        columned = sample_board_data.iloc[5:]
+
+        db_board.save_stock_board_many(code, [indexed, columned])
+
+        loaded_df = db_board.load_stock_board_from_cache(code)
+        assert len(loaded_df) == len(sample_board_data)
+        assert list(loaded_df["Timestamp"]) == list(sample_board_data["Timestamp"])
+
+    def test_save_stock_board_many_empty(self, db_board):
+        """空のDataFrameのみの一括保存テスト"""
+        code = "1234"
+
+        db_board.save_stock_board_many(code, [pd.DataFrame(), None])
+
+        loaded_df = db_board.load_stock_board_from_cache(code)
+        assert loaded_df.empty
+
     def test_save_board_data_with_lowercase_code_column(
         self, db_board, sample_board_data_from_api
     ):
@@ -403,7 +548,7 @@ class TestDbStocksBoard:
         code = "6363"
 
         # kabuステーションAPIのレスポンス形式を再現
-        timestamps = pd.date_range(start="2024-01-01 09:00:00", periods=5, freq="1min")
+        timestamps = _TS_0900[:5]
         data = {
             "Timestamp": timestamps,
             "Price": [1500.0, 1501.0, 1499.0, 1502.0, 1498.0],
@@ -431,7 +576,7 @@ class TestDbStocksBoard:
         code = "8306"
 
         # 立花証券e支店APIのレスポンス形式を再現
-        timestamps = pd.date_range(start="2024-01-01 09:00:00", periods=5, freq="1min")
+        timestamps = _TS_0900[:5]
         data = {
             "Timestamp": timestamps,
             "Price": [800.0, 801.0, 799.0, 802.0, 798.0],
@@ -459,7 +604,7 @@ class TestDbStocksBoard:
         code = "1234"
 
         # 小文字のcodeカラムを持つDataFrameを作成
-        timestamps = pd.date_range(start="2024-01-01 09:00:00", periods=3, freq="1min")
+        timestamps = _TS_0900[:3]
         data = {
             "Timestamp": timestamps,
             "Price": [100.0, 101.0, 102.0],
@@ -12,11 +12,14 @@ sys.path.insert(0, os.path.abspath("src"))
 
 from BackcastPro.api.db_stocks_daily import db_stocks_daily
 
+# Resolved once at import instead of on every setUp
+_CACHE_DIR = os.path.abspath("test_cache_db_stocks_daily")
+
 
 class TestDbStocksDaily(unittest.TestCase):
     def setUp(self):
         # Set cache dir to a temp path
-        self.test_cache_dir = os.path.abspath("test_cache_db_stocks_daily")
+        self.test_cache_dir = _CACHE_DIR
         os.environ["STOCKDATA_CACHE_DIR"] = self.test_cache_dir
 
         # Initialize the class under test
@@ -1,151 +1,195 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import os
-import shutil
 import sys
 import logging
 
 import pandas as pd
+import pytest
+
+# Skip the whole module at collection time when duckdb is unavailable
+pytest.importorskip("duckdb")
 
 # Ensure src is in pythonpath
 sys.path.insert(0, os.path.abspath("src"))
 
 from BackcastPro.api.db_stocks_info import db_stocks_info
 
-
-class TestDbStocksInfo(unittest.TestCase):
-    def setUp(self):
-        # Set cache dir to a temp path to avoid cluttering unrelated dirs
-        self.test_cache_dir = os.path.abspath("test_cache_db_stocks_info")
-        os.environ["STOCKDATA_CACHE_DIR"] = self.test_cache_dir
+# テストデータは1度だけ作成し、各テストには浅いコピーを渡す
+# （save_listed_info() は入力DataFrameを変更しない）
+_V2_API_DF = pd.DataFrame(
+    {
+        "Date": ["2025-01-06"],
+        "Code": ["7203"],
+        "CoName": ["トヨタ自動車"],
+        "CoNameEn": ["TOYOTA MOTOR CORPORATION"],
+        "S17": ["7"],
+        "S17Nm": ["自動車・輸送機"],
+        "S33": ["15"],
+        "S33Nm": ["輸送用機器"],
+        "ScaleCat": ["TOPIX Large70"],
+        "Mkt": ["0111"],
+        "MktNm": ["プライム"],
+        "Mrgn": ["1"],
+        "MrgnNm": ["貸借"],
+        "source": ["j-quants"],
+    }
+)
+
+_EXPECTED_DF = pd.DataFrame(
+    {
+        "Date": ["2025-01-06"],
+        "Code": ["7203"],
+        "CompanyName": ["トヨタ自動車"],
+        "CompanyNameEnglish": ["TOYOTA MOTOR CORPORATION"],
+        "Sector17Code": ["7"],
+        "Sector17CodeName": ["自動車・輸送機"],
+        "Sector33Code": ["15"],
+        "Sector33CodeName": ["輸送用機器"],
+        "ScaleCategory": ["TOPIX Large70"],
+        "MarketCode": ["0111"],
+        "MarketCodeName": ["プライム"],
+    }
+)
+
+
+# jquants._get_all_pages() の差し替えが返す V2 API レスポンス（短縮カラム名）
+_V2_PAGES = (
+    {
+        "Date": "2025-01-06",
+        "Code": "72030",
+        "CoName": "トヨタ自動車",
+        "CoNameEn": "TOYOTA MOTOR CORPORATION",
+        "S17": "7",
+        "S17Nm": "自動車・輸送機",
+        "S33": "15",
+        "S33Nm": "輸送用機器",
+        "ScaleCat": "TOPIX Large70",
+        "Mkt": "0111",
+        "MktNm": "プライム",
+        "Mrgn": "1",
+        "MrgnNm": "貸借",
+    },
+)
+
+
+@pytest.fixture
+def jquants_env(monkeypatch):
+    """ダミーのAPIキーを設定し、jquants シングルトンを未生成の状態にする（テスト後に復元）"""
+    monkeypatch.setenv("JQUANTS_API_KEY", "dummy-key")
+    monkeypatch.setattr(
+        "trading_data.lib.jquants.jquants._instance", None, raising=False
+    )
+
+
+class _ListHandler(logging.Handler):
+    """
+    ロガーに直接取り付けてログレコードを記録するハンドラ
+
+    assertLogs と違い、対象ロガーの propagate やルートロガーの設定を変更しない。
+    """
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def messages(self):
+        return [record.getMessage() for record in self.records]
+
+
+# Block real HTTP (requests/urllib/CloudRunClient) for every test in this module
+pytestmark = pytest.mark.usefixtures("no_network")
+
+
+class TestDbStocksInfo:
+    @pytest.fixture(autouse=True)
+    def _isolated_cache_dir(self, tmp_path, monkeypatch):
+        # Per-test cache dir under pytest's tmp_path (unique per xdist worker,
+        # cleaned up by pytest)
+        self.test_cache_dir = str(tmp_path)
+        monkeypatch.setenv("STOCKDATA_CACHE_DIR", self.test_cache_dir)
 
         # Initialize the class under test
         self.db_info = db_stocks_info()
 
-    def tearDown(self):
-        # Remove the temporary cache directory
-        if os.path.exists(self.test_cache_dir):
-            try:
-                shutil.rmtree(self.test_cache_dir)
-            except Exception:
-                pass
-
-        # Unset the env var
-        if "STOCKDATA_CACHE_DIR" in os.environ:
-            del os.environ["STOCKDATA_CACHE_DIR"]
-
-    def test_download_from_cloud_success(self):
-        """Test successful download from Cloud Run"""
-        with patch(
-            "BackcastPro.api.cloud_run_client.CloudRunClient"
-        ) as mock_client_cls:
-            mock_client = MagicMock()
-            mock_client_cls.return_value = mock_client
-            mock_client.config.is_configured.return_value = True
-            mock_client.download_file.return_value = True
-
-            test_path = os.path.join(self.test_cache_dir, "test_downloaded.duckdb")
-            os.makedirs(os.path.dirname(test_path), exist_ok=True)
-
-            result = self.db_info._download_from_cloud(test_path)
-
-            self.assertTrue(result, "Download should return True on success")
+    @pytest.fixture
+    def mock_client_cls(self):
+        with patch("BackcastPro.api.cloud_run_client.CloudRunClient") as mock:
+            yield mock
+
+    @pytest.mark.parametrize(
+        "configured, download_ok, expected",
+        [
+            pytest.param(True, True, True, id="success"),
+            pytest.param(True, False, False, id="failure"),
+            pytest.param(False, None, False, id="not_configured"),
+        ],
+    )
+    def test_download_from_cloud(
+        self, mock_client_cls, configured, download_ok, expected
+    ):
+        """Test _download_from_cloud for success, failure and unconfigured Cloud Run"""
+        mock_client = mock_client_cls.return_value
+        mock_client.config.is_configured.return_value = configured
+        if download_ok is not None:
+            mock_client.download_file.return_value = download_ok
+
+        test_path = os.path.join(self.test_cache_dir, "test_downloaded.duckdb")
+
+        result = self.db_info._download_from_cloud(test_path)
+
+        assert result is expected
+        if download_ok:
             mock_client.download_file.assert_called_once_with(
                 "jp/listed_info.duckdb", test_path
             )
+        elif not configured:
+            mock_client.download_file.assert_not_called()
 
-    def test_download_from_cloud_failure(self):
-        """Test failure during Cloud Run download"""
-        with patch(
-            "BackcastPro.api.cloud_run_client.CloudRunClient"
-        ) as mock_client_cls:
-            mock_client = MagicMock()
-            mock_client_cls.return_value = mock_client
-            mock_client.config.is_configured.return_value = True
-            mock_client.download_file.return_value = False
-
-            test_path = os.path.join(self.test_cache_dir, "test_fail.duckdb")
-
-            result = self.db_info._download_from_cloud(test_path)
 
-            self.assertFalse(result, "Download should return False on failure")
+@pytest.fixture(scope="class")
+def listed_info_db(request, tmp_path_factory):
+    """
+    クラスで共有する db_stocks_info を専用の一時キャッシュディレクトリで作成する
 
-    def test_download_from_cloud_not_configured(self):
-        """Test behavior when Cloud Run is not configured"""
-        with patch(
-            "BackcastPro.api.cloud_run_client.CloudRunClient"
-        ) as mock_client_cls:
-            mock_client = MagicMock()
-            mock_client_cls.return_value = mock_client
-            mock_client.config.is_configured.return_value = False
-
-            test_path = os.path.join(self.test_cache_dir, "test_notconfigured.duckdb")
-
-            result = self.db_info._download_from_cloud(test_path)
-
-            self.assertFalse(result, "Download should return False if not configured")
+    ディレクトリは pytest の tmp_path_factory 配下（ワーカーごとに固有）に作られ、
+    後片付けも pytest に任せる。
+    """
+    cache_dir = str(tmp_path_factory.mktemp("listed_info"))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("STOCKDATA_CACHE_DIR", cache_dir)
+        db_info = db_stocks_info()
+        mp.setattr(db_info, "_download_from_cloud", lambda *args, **kwargs: False)
+        request.cls.test_cache_dir = cache_dir
+        request.cls.db_info = db_info
+        yield db_info
 
 
+@pytest.mark.usefixtures("listed_info_db")
 class TestSaveListedInfoColumnValidation(unittest.TestCase):
     """save_listed_info() の必須カラムバリデーションテスト"""
 
-    def setUp(self):
-        self.test_cache_dir = os.path.abspath("test_cache_save_listed_info")
-        os.environ["STOCKDATA_CACHE_DIR"] = self.test_cache_dir
-        self.db_info = db_stocks_info()
-        self._download_patcher = patch.object(
-            self.db_info, "_download_from_cloud", return_value=False
-        )
-        self._download_patcher.start()
-
     def tearDown(self):
-        self._download_patcher.stop()
-        if os.path.exists(self.test_cache_dir):
-            try:
-                shutil.rmtree(self.test_cache_dir)
-            except Exception:
-                pass
-        if "STOCKDATA_CACHE_DIR" in os.environ:
-            del os.environ["STOCKDATA_CACHE_DIR"]
+        # 次のテストが空のキャッシュから始まるようにテーブルを削除
+        self._truncate_listed_info()
+
+    def _truncate_listed_info(self):
+        """保存済みの listed_info テーブルを削除する（DBファイルは残す）"""
+        if not os.path.exists(self.db_info._get_db_path()):
+            return
+        with self.db_info.get_db() as db:
+            db.execute("DROP TABLE IF EXISTS listed_info")
 
     def _make_v2_api_dataframe(self) -> pd.DataFrame:
         """J-Quants V2 API の実際のレスポンス形式（短縮カラム名）を再現"""
-        return pd.DataFrame(
-            {
-                "Date": ["2025-01-06"],
-                "Code": ["7203"],
-                "CoName": ["トヨタ自動車"],
-                "CoNameEn": ["TOYOTA MOTOR CORPORATION"],
-                "S17": ["7"],
-                "S17Nm": ["自動車・輸送機"],
-                "S33": ["15"],
-                "S33Nm": ["輸送用機器"],
-                "ScaleCat": ["TOPIX Large70"],
-                "Mkt": ["0111"],
-                "MktNm": ["プライム"],
-                "Mrgn": ["1"],
-                "MrgnNm": ["貸借"],
-                "source": ["j-quants"],
-            }
-        )
+        return _V2_API_DF.copy(deep=False)
 
     def _make_expected_dataframe(self) -> pd.DataFrame:
         """save_listed_info() が期待する長いカラム名の DataFrame"""
-        return pd.DataFrame(
-            {
-                "Date": ["2025-01-06"],
-                "Code": ["7203"],
-                "CompanyName": ["トヨタ自動車"],
-                "CompanyNameEnglish": ["TOYOTA MOTOR CORPORATION"],
-                "Sector17Code": ["7"],
-                "Sector17CodeName": ["自動車・輸送機"],
-                "Sector33Code": ["15"],
-                "Sector33CodeName": ["輸送用機器"],
-                "ScaleCategory": ["TOPIX Large70"],
-                "MarketCode": ["0111"],
-                "MarketCodeName": ["プライム"],
-            }
-        )
+        return _EXPECTED_DF.copy(deep=False)
 
     def test_v2_api_response_missing_required_columns(self):
         """
@@ -159,20 +203,25 @@ class TestSaveListedInfoColumnValidation(unittest.TestCase):
         """
         df_v2 = self._make_v2_api_dataframe()
 
-        with self.assertLogs("BackcastPro.api.db_stocks_info", level="WARNING") as cm:
+        logger = logging.getLogger("BackcastPro.api.db_stocks_info")
+        handler = _ListHandler(level=logging.WARNING)
+        logger.addHandler(handler)
+        try:
             self.db_info.save_listed_info(df_v2)
+        finally:
+            logger.removeHandler(handler)
 
-        # "必須カラムが不足しています" の警告が出ることを確認
-        warning_messages = [
-            log for log in cm.output if "必須カラムが不足しています" in log
-        ]
-        self.assertTrue(
-            len(warning_messages) > 0,
+        # "必須カラムが不足しています" の警告が出ることを確認（最初の1件のみ使う）
+        warning_text = next(
+            (log for log in handler.messages() if "必須カラムが不足しています" in log),
+            None,
+        )
+        self.assertIsNotNone(
+            warning_text,
             "V2 API の短縮カラム名では必須カラム不足の警告が出るべき",
         )
 
         # 不足カラム名が警告メッセージに含まれていることを確認
-        warning_text = warning_messages[0]
         expected_missing = [
             "CompanyName",
             "CompanyNameEnglish",
@@ -184,12 +233,11 @@ class TestSaveListedInfoColumnValidation(unittest.TestCase):
             "MarketCode",
             "MarketCodeName",
         ]
-        for col in expected_missing:
-            self.assertIn(
-                col,
-                warning_text,
-                f"不足カラム '{col}' が警告メッセージに含まれるべき",
-            )
+        not_reported = [col for col in expected_missing if col not in warning_text]
+        self.assertFalse(
+            not_reported,
+            f"不足カラム {not_reported} が警告メッセージに含まれるべき",
+        )
 
     def test_v2_api_response_data_not_saved(self):
         """
@@ -223,6 +271,7 @@ class TestSaveListedInfoColumnValidation(unittest.TestCase):
         self.assertEqual(cached.iloc[0]["Code"], "7203")
         self.assertEqual(cached.iloc[0]["CompanyName"], "トヨタ自動車")
 
+    @pytest.mark.usefixtures("jquants_env")
     def test_jquants_renames_v2_short_columns(self):
         """
         jquants.get_listed_info() が V2 API の短縮カラム名を
@@ -230,77 +279,51 @@ class TestSaveListedInfoColumnValidation(unittest.TestCase):
         """
         from trading_data.lib.jquants import jquants
 
-        # シングルトンリセット
-        jquants._instance = None
-        os.environ["JQUANTS_API_KEY"] = "dummy-key"
-
-        try:
-            jq = jquants()
-
-            # V2 API の実際のレスポンス形式を模擬
-            def fake_get_all_pages(endpoint, params):
-                return [
-                    {
-                        "Date": "2025-01-06",
-                        "Code": "72030",
-                        "CoName": "トヨタ自動車",
-                        "CoNameEn": "TOYOTA MOTOR CORPORATION",
-                        "S17": "7",
-                        "S17Nm": "自動車・輸送機",
-                        "S33": "15",
-                        "S33Nm": "輸送用機器",
-                        "ScaleCat": "TOPIX Large70",
-                        "Mkt": "0111",
-                        "MktNm": "プライム",
-                        "Mrgn": "1",
-                        "MrgnNm": "貸借",
-                    }
-                ]
-
-            jq._get_all_pages = fake_get_all_pages
-
-            df = jq.get_listed_info(code="7203")
-
-            # 短縮カラム名がリネームされていることを確認
-            expected_renames = {
-                "CompanyName": "トヨタ自動車",
-                "CompanyNameEnglish": "TOYOTA MOTOR CORPORATION",
-                "Sector17Code": "7",
-                "Sector17CodeName": "自動車・輸送機",
-                "Sector33Code": "15",
-                "Sector33CodeName": "輸送用機器",
-                "ScaleCategory": "TOPIX Large70",
-                "MarketCode": "0111",
-                "MarketCodeName": "プライム",
-            }
-            for col, expected_val in expected_renames.items():
-                self.assertIn(col, df.columns, f"カラム '{col}' が存在すべき")
-                self.assertEqual(df.iloc[0][col], expected_val)
-
-            # 短縮カラム名は残っていないことを確認
-            short_names = [
-                "CoName",
-                "CoNameEn",
-                "S17",
-                "S17Nm",
-                "S33",
-                "S33Nm",
-                "ScaleCat",
-                "Mkt",
-                "MktNm",
-            ]
-            for short in short_names:
-                self.assertNotIn(
-                    short,
-                    df.columns,
-                    f"短縮カラム名 '{short}' はリネーム後に残らないべき",
-                )
-
-        finally:
-            jquants._instance = None
-            if "JQUANTS_API_KEY" in os.environ:
-                del os.environ["JQUANTS_API_KEY"]
+        jq = jquants()
+
+        # V2 API の実際のレスポンス形式を模擬
+        def fake_get_all_pages(endpoint, params):
+            return _V2_PAGES
+
+        jq._get_all_pages = fake_get_all_pages
+
+        df = jq.get_listed_info(code="7203")
+
+        # 短縮カラム名がリネームされていることを確認
+        expected_renames = {
+            "CompanyName": "トヨタ自動車",
+            "CompanyNameEnglish": "TOYOTA MOTOR CORPORATION",
+            "Sector17Code": "7",
+            "Sector17CodeName": "自動車・輸送機",
+            "Sector33Code": "15",
+            "Sector33CodeName": "輸送用機器",
+            "ScaleCategory": "TOPIX Large70",
+            "MarketCode": "0111",
+            "MarketCodeName": "プライム",
+        }
+        missing = set(expected_renames) - set(df.columns)
+        self.assertFalse(missing, f"カラム {sorted(missing)} が存在すべき")
+        self.assertEqual(df.iloc[0][list(expected_renames)].to_dict(), expected_renames)
+
+        # 短縮カラム名は残っていないことを確認
+        short_names = [
+            "CoName",
+            "CoNameEn",
+            "S17",
+            "S17Nm",
+            "S33",
+            "S33Nm",
+            "ScaleCat",
+            "Mkt",
+            "MktNm",
+        ]
+        remaining = set(short_names) & set(df.columns)
+        self.assertFalse(
+            remaining,
+            f"短縮カラム名 {sorted(remaining)} はリネーム後に残らないべき",
+        )
 
+    @pytest.mark.usefixtures("jquants_env")
     def test_v2_response_saves_to_db_after_rename(self):
         """
         V2 API レスポンスが jquants.get_listed_info() でリネームされた後、
@@ -308,53 +331,28 @@ class TestSaveListedInfoColumnValidation(unittest.TestCase):
         """
         from trading_data.lib.jquants import jquants
 
-        jquants._instance = None
-        os.environ["JQUANTS_API_KEY"] = "dummy-key"
+        jq = jquants()
 
-        try:
-            jq = jquants()
-
-            def fake_get_all_pages(endpoint, params):
-                return [
-                    {
-                        "Date": "2025-01-06",
-                        "Code": "72030",
-                        "CoName": "トヨタ自動車",
-                        "CoNameEn": "TOYOTA MOTOR CORPORATION",
-                        "S17": "7",
-                        "S17Nm": "自動車・輸送機",
-                        "S33": "15",
-                        "S33Nm": "輸送用機器",
-                        "ScaleCat": "TOPIX Large70",
-                        "Mkt": "0111",
-                        "MktNm": "プライム",
-                        "Mrgn": "1",
-                        "MrgnNm": "貸借",
-                    }
-                ]
-
-            jq._get_all_pages = fake_get_all_pages
-
-            df = jq.get_listed_info(code="7203")
-            # stocks_info._fetch_from_jquants と同じ処理
-            df["Code"] = df["Code"].str[:4]
-
-            # save_listed_info で保存できる
-            self.db_info.save_listed_info(df)
-
-            # キャッシュから読み込める
-            cached = self.db_info.load_listed_info_from_cache()
-            self.assertFalse(
-                cached.empty, "V2 レスポンスがリネーム後に保存・読み込みできるべき"
-            )
-            self.assertEqual(cached.iloc[0]["Code"], "7203")
-            self.assertEqual(cached.iloc[0]["CompanyName"], "トヨタ自動車")
-            self.assertEqual(cached.iloc[0]["Sector17CodeName"], "自動車・輸送機")
+        def fake_get_all_pages(endpoint, params):
+            return _V2_PAGES
 
-        finally:
-            jquants._instance = None
-            if "JQUANTS_API_KEY" in os.environ:
-                del os.environ["JQUANTS_API_KEY"]
+        jq._get_all_pages = fake_get_all_pages
+
+        df = jq.get_listed_info(code="7203")
+        # stocks_info._fetch_from_jquants と同じ処理
+        df["Code"] = df["Code"].str[:4]
+
+        # save_listed_info で保存できる
+        self.db_info.save_listed_info(df)
+
+        # キャッシュから読み込める
+        cached = self.db_info.load_listed_info_from_cache()
+        self.assertFalse(
+            cached.empty, "V2 レスポンスがリネーム後に保存・読み込みできるべき"
+        )
+        self.assertEqual(cached.iloc[0]["Code"], "7203")
+        self.assertEqual(cached.iloc[0]["CompanyName"], "トヨタ自動車")
+        self.assertEqual(cached.iloc[0]["Sector17CodeName"], "自動車・輸送機")
 
 
 if __name__ == "__main__":
@@ -5,12 +5,37 @@ kabuステーションAPI Client (kabusap.py) のテスト
 import json
 import os
 
+import numpy as np
 import pandas as pd
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 from trading_data.lib.kabusap import kabusap
 
+# get_board() が返す DataFrame に必ず含まれるカラム
+BOARD_COLUMNS = frozenset({"Price", "Qty", "Type"})
+
+
+class _FakeResp:
+    """urlopen() の戻り値を模したコンテキストマネージャ（MagicMock を使わない）"""
+
+    def __init__(self, body):
+        self._body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def read(self):
+        return self._body
+
+
+def _ok(payload):
+    """payload を JSON として返すレスポンスを作成"""
+    return _FakeResp(json.dumps(payload).encode("utf-8"))
+
 
 @pytest.fixture(autouse=True)
 def reset_singleton():
@@ -20,6 +45,16 @@ def reset_singleton():
     kabusap._instance = None
 
 
+@pytest.fixture(scope="class")
+def board_client():
+    """トークン取得を行わない kabusap をクラスで1つだけ生成"""
+    with patch.dict(os.environ, {"KABUSAP_API_PASSWORD": ""}, clear=False):
+        kabusap._instance = None
+        k = kabusap()
+    kabusap._instance = None
+    return k
+
+
 class TestKabusapSingleton:
     """シングルトンパターンのテスト"""
 
@@ -51,13 +86,7 @@ class TestSetToken:
     @patch("trading_data.lib.kabusap.urllib.request.urlopen")
     def test_successful_token(self, mock_urlopen):
         """トークン取得成功"""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {"ResultCode": 0, "Token": "test-token-123"}
-        ).encode("utf-8")
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = _ok({"ResultCode": 0, "Token": "test-token-123"})
 
         with patch.dict(
             os.environ, {"KABUSAP_API_PASSWORD": "test_pass"}, clear=False
@@ -70,13 +99,9 @@ class TestSetToken:
     @patch("trading_data.lib.kabusap.urllib.request.urlopen")
     def test_token_no_token_in_response(self, mock_urlopen):
         """レスポンスにTokenがない場合"""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
+        mock_urlopen.return_value = _ok(
             {"ResultCode": 1, "Message": "Invalid password"}
-        ).encode("utf-8")
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        )
 
         with patch.dict(
             os.environ, {"KABUSAP_API_PASSWORD": "wrong_pass"}, clear=False
@@ -119,33 +144,36 @@ class TestRefreshToken:
 class TestGetBoard:
     """get_board() のテスト"""
 
-    def test_not_enabled_returns_empty(self):
+    @pytest.fixture(autouse=True)
+    def client(self, board_client):
+        """API有効・トークン取得済みの状態に戻してから各テストに渡す"""
+        board_client.isEnable = True
+        board_client.api_key = "test-token"
+        return board_client
+
+    @pytest.fixture
+    def mock_urlopen(self):
+        with patch("trading_data.lib.kabusap.urllib.request.urlopen") as mock:
+            yield mock
+
+    def test_not_enabled_returns_empty(self, client):
         """API無効時は空のDataFrame"""
-        with patch.dict(os.environ, {"KABUSAP_API_PASSWORD": ""}, clear=False):
-            k = kabusap()
-            k.isEnable = False
-            result = k.get_board("8306")
-            assert isinstance(result, pd.DataFrame)
-            assert result.empty
+        client.isEnable = False
+        result = client.get_board("8306")
+        assert isinstance(result, pd.DataFrame)
+        assert result.empty
 
-    def test_empty_code_returns_empty(self):
+    def test_empty_code_returns_empty(self, client):
         """空の銘柄コードは空のDataFrame"""
-        with patch.dict(os.environ, {"KABUSAP_API_PASSWORD": ""}, clear=False):
-            k = kabusap()
-            k.isEnable = True
-            result = k.get_board("")
-            assert result.empty
+        result = client.get_board("")
+        assert result.empty
 
-    def test_none_code_returns_empty(self):
+    def test_none_code_returns_empty(self, client):
         """None銘柄コードは空のDataFrame"""
-        with patch.dict(os.environ, {"KABUSAP_API_PASSWORD": ""}, clear=False):
-            k = kabusap()
-            k.isEnable = True
-            result = k.get_board(None)
-            assert result.empty
+        result = client.get_board(None)
+        assert result.empty
 
-    @patch("trading_data.lib.kabusap.urllib.request.urlopen")
-    def test_successful_board_buy_sell_format(self, mock_urlopen):
+    def test_successful_board_buy_sell_format(self, client, mock_urlopen):
         """Buy/Sell形式の板情報取得"""
         response_data = {
             "Buy1": {"Price": 1000.0, "Qty": 100},
@@ -153,50 +181,26 @@ class TestGetBoard:
             "Sell1": {"Price": 1001.0, "Qty": 150},
             "Sell2": {"Price": 1002.0, "Qty": 250},
         }
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(response_data).encode("utf-8")
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = _ok(response_data)
 
-        with patch.dict(os.environ, {"KABUSAP_API_PASSWORD": ""}, clear=False):
-            k = kabusap()
-            k.isEnable = True
-            k.api_key = "test-token"
-            df = k.get_board("8306")
+        df = client.get_board("8306")
 
-            assert isinstance(df, pd.DataFrame)
-            assert not df.empty
-            assert "Price" in df.columns
-            assert "Qty" in df.columns
-            assert "Type" in df.columns
-            assert set(df["Type"].unique()) == {"Bid", "Ask"}
+        assert isinstance(df, pd.DataFrame)
+        assert not df.empty
+        assert BOARD_COLUMNS <= frozenset(df.columns)
+        assert frozenset(np.unique(df["Type"].to_numpy())) == {"Bid", "Ask"}
 
-    @patch("trading_data.lib.kabusap.urllib.request.urlopen")
-    def test_board_api_error(self, mock_urlopen):
+    def test_board_api_error(self, client, mock_urlopen):
         """APIエラー時は空のDataFrame"""
         response_data = {"ResultCode": 4, "Message": "Invalid code"}
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(response_data).encode("utf-8")
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_urlopen.return_value = _ok(response_data)
 
-        with patch.dict(os.environ, {"KABUSAP_API_PASSWORD": ""}, clear=False):
-            k = kabusap()
-            k.isEnable = True
-            k.api_key = "test-token"
-            df = k.get_board("9999")
-            assert df.empty
+        df = client.get_board("9999")
+        assert df.empty
 
-    @patch("trading_data.lib.kabusap.urllib.request.urlopen")
-    def test_board_connection_error(self, mock_urlopen):
+    def test_board_connection_error(self, client, mock_urlopen):
         """接続エラー時は空のDataFrame"""
         mock_urlopen.side_effect = Exception("Connection refused")
 
-        with patch.dict(os.environ, {"KABUSAP_API_PASSWORD": ""}, clear=False):
-            k = kabusap()
-            k.isEnable = True
-            k.api_key = "test-token"
-            df = k.get_board("8306")
-            assert df.empty
+        df = client.get_board("8306")
+        assert df.empty
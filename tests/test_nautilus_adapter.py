@@ -5,49 +5,75 @@ NautilusBacktest ユニットテスト
 nautilus_adapter.py (NautilusBacktest) が BackcastPro.Backtest と
 同じ API を提供することを検証する。
 """
-import sys
-import os
-
 import pandas as pd
-import numpy as np
 import pytest
 
-# nautilus_adapter.py が marimo/src-tauri/resources/files/ にあるためパスを追加
-# BackcastPro/tests/ → BackcastPro/ → Documents/ → marimo/src-tauri/resources/files/
-_FILES_DIR = os.path.join(
-    os.path.dirname(__file__),
-    "..", "..", "marimo", "src-tauri", "resources", "files"
+# nautilus_adapter.py は marimo/src-tauri/resources/files/ にある
+# （pyproject.toml の [tool.pytest.ini_options] pythonpath で追加済み）
+from nautilus_adapter import NautilusBacktest, BankruptError
+
+
+# get_state_snapshot() が返すべきキー
+SNAPSHOT_KEYS = (
+    "current_time", "progress", "equity", "cash",
+    "position", "positions", "closed_trades", "step_index", "total_steps"
 )
-sys.path.insert(0, os.path.abspath(_FILES_DIR))
 
-from nautilus_adapter import NautilusBacktest, BankruptError
+# テスト用合成データは conftest.py の synthetic_df_30 フィクスチャ（セッション共有）を使う
 
 
-# ---------------------------------------------------------------------------
-# テスト用合成データ生成
-# ---------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def session_bt(synthetic_df_30):
+    """モジュールで共有する NautilusBacktest（構築は1回だけ）"""
+    return NautilusBacktest(data={"7203": synthetic_df_30}, cash=100_000)
 
-def create_synthetic_df(days: int = 30, start_price: float = 2500.0) -> pd.DataFrame:
-    """テスト用 OHLCV DataFrame を生成する"""
-    dates = pd.date_range(start="2024-01-01", periods=days, freq="B")  # 営業日
-    np.random.seed(42)
-    prices = start_price + np.cumsum(np.random.randn(days) * 10)
-    prices = np.maximum(prices, 100)  # 負値防止
-
-    df = pd.DataFrame(
-        {
-            "Open": prices * (1 + np.random.randn(days) * 0.002),
-            "High": prices * (1 + np.abs(np.random.randn(days) * 0.005)),
-            "Low": prices * (1 - np.abs(np.random.randn(days) * 0.005)),
-            "Close": prices,
-            "Volume": np.random.randint(1000, 10000, days).astype(float),
-        },
-        index=dates,
-    )
-    return df
+
+@pytest.fixture
+def fresh_bt(session_bt):
+    """
+    共有インスタンスを初期状態（cash=100,000・ステップ0）に戻して渡す
+
+    戦略や取引コールバックを登録するテスト、コンストラクタの挙動を検証する
+    テストでは使わず、NautilusBacktest を直接構築すること。
+    """
+    session_bt.set_cash(100_000)
+    session_bt.reset()
+    return session_bt
 
 
-SYNTHETIC_DF = create_synthetic_df(30)
+@pytest.fixture
+def bt_with_open_long(session_bt):
+    """
+    cash=1,000,000 で 1 ステップ進め、7203 を 100 株買って約定させた状態
+
+    step() → buy() → step() の共通ウォームアップをまとめたもの。
+    """
+    session_bt.set_cash(1_000_000)
+    session_bt.reset()
+    session_bt.step()
+    session_bt.buy(code="7203", size=100)
+    session_bt.step()  # 注文約定
+    return session_bt
+
+
+@pytest.fixture(scope="module")
+def finished_bt(synthetic_df_30):
+    """
+    最後まで実行済みの NautilusBacktest（モジュールで1回だけ実行する）
+
+    1バーずつ step() を呼ぶ Python ループではなく goto() で最終バーまで進める。
+    結果を読むだけのテスト専用。テスト内で状態を変更しないこと。
+    """
+    bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=100_000)
+    bt.goto(len(synthetic_df_30))
+    assert bt.is_finished
+    return bt
+
+
+@pytest.fixture(scope="module")
+def finalize_result(finished_bt):
+    """finished_bt の finalize() の結果（モジュールで1回だけ呼ぶ）"""
+    return finished_bt.finalize()
 
 
 # ---------------------------------------------------------------------------
@@ -57,14 +83,14 @@ SYNTHETIC_DF = create_synthetic_df(30)
 class TestPhase0Compat:
     """BackcastPro 互換 API の存在確認"""
 
-    def test_trades_is_property_not_callable(self):
+    def test_trades_is_property_not_callable(self, fresh_bt):
         """`bt.trades` が property であり callable でないこと"""
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+        bt = fresh_bt
         assert not callable(bt.trades), "bt.trades は property であり関数ではない"
 
-    def test_has_chart_state_compatible_interface(self):
+    def test_has_chart_state_compatible_interface(self, synthetic_df_30):
         """_chart_state は NautilusBacktest 側で透過的に設定できること（動的属性）"""
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=100_000)
         bt._chart_state = object()  # 動的属性として設定できる
         assert hasattr(bt, "_chart_state")
 
@@ -76,28 +102,28 @@ class TestPhase0Compat:
 class TestStepExecution:
     """step() の基本動作"""
 
-    def test_step_increments_step_index(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_step_increments_step_index(self, fresh_bt):
+        bt = fresh_bt
         assert bt.step_index == 0
         bt.step()
         assert bt.step_index == 1
         bt.step()
         assert bt.step_index == 2
 
-    def test_step_returns_true_while_running(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_step_returns_true_while_running(self, fresh_bt):
+        bt = fresh_bt
         result = bt.step()
         assert result is True
 
-    def test_step_returns_false_when_finished(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_step_returns_false_when_finished(self, fresh_bt):
+        bt = fresh_bt
         while bt.step():
             pass
         assert bt.step() is False
         assert bt.is_finished is True
 
-    def test_is_finished_false_at_start(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_is_finished_false_at_start(self, fresh_bt):
+        bt = fresh_bt
         assert bt.is_finished is False
 
 
@@ -108,7 +134,7 @@ class TestStepExecution:
 class TestDataVisibility:
     """戦略呼び出し時の current_data 可視性"""
 
-    def test_current_data_visible_to_strategy(self):
+    def test_current_data_visible_to_strategy(self, synthetic_df_30):
         """step() 内で戦略が呼ばれる時点で現在バーが bt.data に見えること"""
         seen_lengths = []
 
@@ -116,7 +142,7 @@ class TestDataVisibility:
             if "7203" in bt.data:
                 seen_lengths.append(len(bt.data["7203"]))
 
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=100_000)
         bt.set_strategy(strategy)
         bt.step()  # step 1
         bt.step()  # step 2
@@ -125,15 +151,15 @@ class TestDataVisibility:
             f"戦略実行時のデータ行数が想定と異なる: {seen_lengths}"
         )
 
-    def test_set_data_auto_starts(self):
+    def test_set_data_auto_starts(self, synthetic_df_30):
         """set_data() 後に明示的 start() なしで step() が動作すること"""
         bt = NautilusBacktest(cash=100_000)
-        bt.set_data({"7203": SYNTHETIC_DF})
+        bt.set_data({"7203": synthetic_df_30})
         assert bt.step() is True
 
-    def test_constructor_with_data_auto_starts(self):
+    def test_constructor_with_data_auto_starts(self, synthetic_df_30):
         """コンストラクタで data を渡した場合も step() が動作すること"""
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=100_000)
         assert bt.step() is True
 
 
@@ -144,44 +170,35 @@ class TestDataVisibility:
 class TestBuyAndEquity:
     """買い注文と資産計算"""
 
-    def test_equity_equals_initial_cash_before_step(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
-        assert bt.equity == pytest.approx(100_000, rel=0.01)
+    def test_equity_equals_initial_cash_before_step(self, synthetic_df_30):
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=100_000)
+        assert bt.equity == pytest.approx(100_000, abs=1_000.0)
 
-    def test_buy_reduces_cash(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=1_000_000)
+    def test_buy_reduces_cash(self, synthetic_df_30):
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=1_000_000)
         bt.step()
         initial_cash = bt.cash
         bt.buy(code="7203", size=100)
         bt.step()  # 注文約定
         assert bt.cash < initial_cash
 
-    def test_buy_creates_open_position(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=1_000_000)
-        bt.step()
-        bt.buy(code="7203", size=100)
-        bt.step()  # 注文約定
+    def test_buy_creates_open_position(self, bt_with_open_long):
+        bt = bt_with_open_long
         assert bt.position_of("7203") == 100
 
-    def test_trades_contains_open_position(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=1_000_000)
-        bt.step()
-        bt.buy(code="7203", size=100)
-        bt.step()
+    def test_trades_contains_open_position(self, bt_with_open_long):
+        bt = bt_with_open_long
         assert len(bt.trades) >= 1
         assert bt.trades[0].code == "7203"
         assert bt.trades[0].size == 100
 
-    def test_equity_reflects_mtm(self):
+    def test_equity_reflects_mtm(self, bt_with_open_long):
         """equity が現金 + 保有株の時価を反映すること"""
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=1_000_000)
-        bt.step()
-        bt.buy(code="7203", size=100)
-        bt.step()
+        bt = bt_with_open_long
         # equity = cash + position * current_close
         cash = bt.cash
         pos_size = bt.position_of("7203")
-        close = float(bt.data["7203"]["Close"].iloc[-1])
+        close = bt.data["7203"]["Close"].to_numpy()[-1]
         expected_equity = cash + pos_size * close
         assert bt.equity == pytest.approx(expected_equity, rel=0.01)
 
@@ -193,8 +210,8 @@ class TestBuyAndEquity:
 class TestSell:
     """売り注文"""
 
-    def test_sell_closes_position(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=1_000_000)
+    def test_sell_closes_position(self, synthetic_df_30):
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=1_000_000)
         bt.step()
         bt.buy(code="7203", size=100)
         bt.step()  # 買い約定
@@ -203,12 +220,9 @@ class TestSell:
         bt.step()  # 売り約定
         assert bt.position_of("7203") == 0
 
-    def test_sell_all_via_trade_close(self):
+    def test_sell_all_via_trade_close(self, bt_with_open_long):
         """trade.close() でポジションをクローズできること"""
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=1_000_000)
-        bt.step()
-        bt.buy(code="7203", size=100)
-        bt.step()
+        bt = bt_with_open_long
         for trade in bt.trades:
             if trade.code == "7203":
                 trade.close()
@@ -223,22 +237,18 @@ class TestSell:
 class TestGoto:
     """goto() のステップジャンプ"""
 
-    def test_goto_forward(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
-        bt.goto(5)
-        assert bt.step_index == 5
-
-    def test_goto_backward_resets(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
-        bt.goto(10)
-        bt.goto(3)
-        assert bt.step_index == 3
-
-    def test_goto_zero_equivalent_to_reset(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
-        bt.goto(10)
-        bt.goto(0)
-        assert bt.step_index == 0
+    @pytest.mark.parametrize(
+        "sequence, expected",
+        [
+            pytest.param([5], 5, id="forward"),
+            pytest.param([10, 3], 3, id="backward_resets"),
+            pytest.param([10, 0], 0, id="zero_equivalent_to_reset"),
+        ],
+    )
+    def test_goto_sequences(self, fresh_bt, sequence, expected):
+        for target in sequence:
+            fresh_bt.goto(target)
+        assert fresh_bt.step_index == expected
 
 
 # ---------------------------------------------------------------------------
@@ -248,32 +258,32 @@ class TestGoto:
 class TestProperties:
     """各プロパティの動作"""
 
-    def test_current_time_is_none_before_step(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_current_time_is_none_before_step(self, fresh_bt):
+        bt = fresh_bt
         assert bt.current_time is None
 
-    def test_current_time_updates_after_step(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_current_time_updates_after_step(self, fresh_bt):
+        bt = fresh_bt
         bt.step()
         assert bt.current_time is not None
 
-    def test_progress_is_zero_at_start(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_progress_is_zero_at_start(self, fresh_bt):
+        bt = fresh_bt
         assert bt.progress == 0.0
 
-    def test_progress_increases_with_steps(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_progress_increases_with_steps(self, fresh_bt):
+        bt = fresh_bt
         bt.goto(5)
         assert bt.progress > 0.0
 
-    def test_step_index_is_read_only(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_step_index_is_read_only(self, fresh_bt):
+        bt = fresh_bt
         with pytest.raises(AttributeError):
             bt.step_index = 5
 
-    def test_data_attribute_accessible(self):
+    def test_data_attribute_accessible(self, fresh_bt):
         """_data 属性にアクセスできること（reveal_data() 互換）"""
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+        bt = fresh_bt
         assert "7203" in bt._data
         assert isinstance(bt._data["7203"], pd.DataFrame)
 
@@ -282,22 +292,16 @@ class TestProperties:
 # finalize
 # ---------------------------------------------------------------------------
 
+@pytest.mark.slow
 class TestFinalize:
     """finalize() の動作"""
 
-    def test_finalize_returns_series(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
-        while not bt.is_finished:
-            bt.step()
-        result = bt.finalize()
-        assert isinstance(result, pd.Series)
-
-    def test_finalize_has_required_keys(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
-        bt.run()
-        result = bt.finalize()
+    def test_finalize_returns_series(self, finalize_result):
+        assert type(finalize_result) is pd.Series
+
+    def test_finalize_has_required_keys(self, finalize_result):
         for key in ("Equity Final [$]", "Return [%]", "# Trades"):
-            assert key in result, f"Missing key: {key}"
+            assert key in finalize_result, f"Missing key: {key}"
 
 
 # ---------------------------------------------------------------------------
@@ -307,29 +311,23 @@ class TestFinalize:
 class TestGetStateSnapshot:
     """get_state_snapshot() の動作"""
 
-    def test_returns_dict(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
-        result = bt.get_state_snapshot()
+    def test_returns_dict(self, finished_bt):
+        result = finished_bt.get_state_snapshot()
         assert isinstance(result, dict)
 
-    def test_has_required_keys(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
-        result = bt.get_state_snapshot()
-        for key in (
-            "current_time", "progress", "equity", "cash",
-            "position", "positions", "closed_trades", "step_index", "total_steps"
-        ):
+    def test_has_required_keys(self, finished_bt):
+        result = finished_bt.get_state_snapshot()
+        for key in SNAPSHOT_KEYS:
             assert key in result, f"Missing key: {key}"
 
-    def test_step_index_matches(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_step_index_matches(self, fresh_bt):
+        bt = fresh_bt
         bt.goto(5)
         snapshot = bt.get_state_snapshot()
         assert snapshot["step_index"] == bt.step_index == 5
 
-    def test_current_time_dash_before_step(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
-        snapshot = bt.get_state_snapshot()
+    def test_current_time_dash_before_step(self, fresh_bt):
+        snapshot = fresh_bt.get_state_snapshot()
         assert snapshot["current_time"] == "-"
 
 
@@ -340,8 +338,8 @@ class TestGetStateSnapshot:
 class TestTradeCallback:
     """add_trade_callback() の動作"""
 
-    def test_callback_called_on_buy(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=1_000_000)
+    def test_callback_called_on_buy(self, synthetic_df_30):
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=1_000_000)
         events = []
         bt.add_trade_callback(lambda evt, trade: events.append((evt, trade.code)))
         bt.step()
@@ -349,8 +347,8 @@ class TestTradeCallback:
         bt.step()
         assert len(events) > 0
 
-    def test_callback_receives_buy_event(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=1_000_000)
+    def test_callback_receives_buy_event(self, synthetic_df_30):
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=1_000_000)
         event_types = []
         bt.add_trade_callback(lambda evt, trade: event_types.append(evt))
         bt.step()
@@ -358,8 +356,8 @@ class TestTradeCallback:
         bt.step()
         assert "BUY" in event_types
 
-    def test_multiple_callbacks(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=1_000_000)
+    def test_multiple_callbacks(self, synthetic_df_30):
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=1_000_000)
         calls1, calls2 = [], []
         bt.add_trade_callback(lambda e, t: calls1.append(e))
         bt.add_trade_callback(lambda e, t: calls2.append(e))
@@ -377,25 +375,25 @@ class TestTradeCallback:
 class TestResetAndSetCash:
     """reset() と set_cash() の動作"""
 
-    def test_reset_resets_step_index(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_reset_resets_step_index(self, synthetic_df_30):
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=100_000)
         bt.goto(10)
         bt.reset()
         assert bt.step_index == 0
 
-    def test_reset_clears_positions(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=1_000_000)
+    def test_reset_clears_positions(self, synthetic_df_30):
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=1_000_000)
         bt.step()
         bt.buy(code="7203", size=100)
         bt.step()
         bt.reset()
         assert bt.position_of("7203") == 0
 
-    def test_set_cash_takes_effect_after_reset(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=100_000)
+    def test_set_cash_takes_effect_after_reset(self, synthetic_df_30):
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=100_000)
         bt.set_cash(500_000)
         bt.reset()
-        assert bt.equity == pytest.approx(500_000, rel=0.01)
+        assert bt.equity == pytest.approx(500_000, abs=5_000.0)
 
 
 # ---------------------------------------------------------------------------
@@ -405,8 +403,9 @@ class TestResetAndSetCash:
 class TestAllApiMethods:
     """全メソッド・プロパティが例外なく呼び出せること"""
 
-    def test_all_api_smoke(self):
-        bt = NautilusBacktest(data={"7203": SYNTHETIC_DF}, cash=500_000)
+    @pytest.mark.slow
+    def test_all_api_smoke(self, synthetic_df_30):
+        bt = NautilusBacktest(data={"7203": synthetic_df_30}, cash=500_000)
         bt.set_cash(500_000)
         bt.set_strategy(lambda b: None)
         bt.start()
@@ -423,9 +422,11 @@ class TestAllApiMethods:
         _ = bt.progress
         _ = bt.step_index
         _ = bt.is_finished
-        _ = bt.get_state_snapshot()
+        snapshot = bt.get_state_snapshot()
+        for key in SNAPSHOT_KEYS:
+            assert key in snapshot, f"Missing key: {key}"
         bt.add_trade_callback(lambda e, t: None)
         bt.reset()
         bt.goto(3)
         result = bt.run()
-        assert isinstance(result, pd.Series)
+        assert type(result) is pd.Series
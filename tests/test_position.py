@@ -2,116 +2,106 @@
 ポジション管理モジュール (position.py) のテスト
 """
 
-import numpy as np
-import pandas as pd
 import pytest
 
 from BackcastPro import Backtest
 
 
-def _create_bt(days=30, cash=1000000):
-    """テスト用Backtestインスタンスを生成"""
-    dates = pd.date_range("2024-01-01", periods=days, freq="D")
-    np.random.seed(42)
-    base = 1000
-    returns = np.random.randn(days) * 0.02
-    prices = base * np.cumprod(1 + returns)
-    df = pd.DataFrame(
-        {
-            "Open": prices * (1 + np.random.randn(days) * 0.003),
-            "High": prices * (1 + np.abs(np.random.randn(days) * 0.01)),
-            "Low": prices * (1 - np.abs(np.random.randn(days) * 0.01)),
-            "Close": prices,
-            "Volume": np.random.randint(1000, 10000, days),
-        },
-        index=dates,
-    )
-    bt = Backtest(data={"TEST": df}, cash=cash)
+@pytest.fixture
+def create_bt(synthetic_df_30_small):
+    """テスト用Backtestインスタンスを生成するファクトリ"""
+
+    def _create_bt(cash=1000000):
+        return Backtest(data={"TEST": synthetic_df_30_small}, cash=cash)
+
+    return _create_bt
+
+
+@pytest.fixture(scope="module")
+def session_bt(synthetic_df_30_small):
+    """モジュールで共有する Backtest（構築は1回だけ）"""
+    return Backtest(data={"TEST": synthetic_df_30_small}, cash=1000000)
+
+
+def _open_position(bt, side, size=10):
+    """リセット後に 5 ステップ進め、TEST を size 株売買して約定させる"""
+    bt.reset()
+    bt.goto(5)
+    getattr(bt, side)(code="TEST", size=size)
+    bt.step()
     return bt
 
 
+@pytest.fixture
+def bt_with_open_long(session_bt):
+    """ロングポジション（10株）を保有した状態の共有 Backtest"""
+    return _open_position(session_bt, "buy")
+
+
 class TestPositionBeforeStart:
     """未開始状態での Position テスト"""
 
-    def test_position_before_start_is_falsy(self):
+    def test_position_before_start_is_falsy(self, create_bt):
         """未開始状態のポジションはFalse"""
-        bt = _create_bt()
+        bt = create_bt()
         assert not bt.position
 
-    def test_position_before_start_size_zero(self):
+    def test_position_before_start_size_zero(self, create_bt):
         """未開始状態のポジションサイズは0"""
-        bt = _create_bt()
+        bt = create_bt()
         assert bt.position.size == 0
 
-    def test_position_before_start_to_dict(self):
+    def test_position_before_start_to_dict(self, create_bt):
         """未開始状態でも to_dict() が正常に動作"""
-        bt = _create_bt()
+        bt = create_bt()
         d = bt.position.to_dict()
         assert d == {"size": 0, "pl": 0, "pl_pct": 0, "is_long": False, "is_short": False}
 
-    def test_position_before_start_close_noop(self):
+    def test_position_before_start_close_noop(self, create_bt):
         """未開始状態での close() はエラーなし"""
-        bt = _create_bt()
+        bt = create_bt()
         bt.position.close()  # should not raise
 
 
 class TestPositionBool:
     """Position のブール値テスト"""
 
-    def test_no_position_is_falsy(self):
+    def test_no_position_is_falsy(self, create_bt):
         """ポジションなしはFalse"""
-        bt = _create_bt()
+        bt = create_bt()
         bt.goto(5)
         assert not bt.position
 
-    def test_long_position_is_truthy(self):
-        """ロングポジションはTrue"""
-        bt = _create_bt()
-        bt.goto(5)
-        bt.buy(code="TEST", size=10)
-        bt.step()
-        assert bt.position
-
-    def test_short_position_is_truthy(self):
-        """ショートポジションはTrue"""
-        bt = _create_bt()
-        bt.goto(5)
-        bt.sell(code="TEST", size=10)
-        bt.step()
+    @pytest.mark.parametrize(
+        "side", [pytest.param("buy", id="long"), pytest.param("sell", id="short")]
+    )
+    def test_open_position_is_truthy(self, session_bt, side):
+        """ロング・ショートどちらのポジションもTrue"""
+        bt = _open_position(session_bt, side)
         assert bt.position
 
 
 class TestPositionSize:
     """Position.size のテスト"""
 
-    def test_size_zero_when_no_trades(self):
+    def test_size_zero_when_no_trades(self, create_bt):
         """取引なしの場合サイズ0"""
-        bt = _create_bt()
+        bt = create_bt()
         bt.goto(5)
         assert bt.position.size == 0
 
-    def test_size_positive_for_long(self):
-        """ロングポジションのサイズは正"""
-        bt = _create_bt()
-        bt.goto(5)
-        bt.buy(code="TEST", size=10)
-        bt.step()
-        assert bt.position.size > 0
-
-    def test_size_negative_for_short(self):
-        """ショートポジションのサイズは負"""
-        bt = _create_bt()
-        bt.goto(5)
-        bt.sell(code="TEST", size=10)
-        bt.step()
-        assert bt.position.size < 0
+    @pytest.mark.parametrize("side, sign", [("buy", 1), ("sell", -1)])
+    @pytest.mark.parametrize("size", [1, 10, 100])
+    def test_position_size_sign(self, session_bt, side, sign, size):
+        """ロングはサイズ正・is_long、ショートはサイズ負・is_short"""
+        bt = _open_position(session_bt, side, size)
+        assert bt.position.size == sign * size
+        assert bt.position.is_long is (sign > 0)
+        assert bt.position.is_short is (sign < 0)
 
-    def test_size_is_sum_of_trades(self):
+    def test_size_is_sum_of_trades(self, bt_with_open_long):
         """複数取引のサイズの合計"""
-        bt = _create_bt()
-        bt.goto(5)
-        bt.buy(code="TEST", size=10)
-        bt.step()
+        bt = bt_with_open_long
         bt.buy(code="TEST", size=5)
         bt.step()
         assert bt.position.size == 15
@@ -120,27 +110,21 @@ class TestPositionSize:
 class TestPositionPL:
     """Position.pl / pl_pct のテスト"""
 
-    def test_pl_is_number(self):
+    def test_pl_is_number(self, bt_with_open_long):
         """P/Lが数値"""
-        bt = _create_bt()
-        bt.goto(5)
-        bt.buy(code="TEST", size=10)
-        bt.step()
+        bt = bt_with_open_long
         bt.step()
         assert isinstance(bt.position.pl, (int, float))
 
-    def test_pl_pct_is_number(self):
+    def test_pl_pct_is_number(self, bt_with_open_long):
         """P/L%が数値"""
-        bt = _create_bt()
-        bt.goto(5)
-        bt.buy(code="TEST", size=10)
-        bt.step()
+        bt = bt_with_open_long
         bt.step()
         assert isinstance(bt.position.pl_pct, (int, float))
 
-    def test_pl_pct_zero_when_no_position(self):
+    def test_pl_pct_zero_when_no_position(self, create_bt):
         """ポジションなしの場合P/L%は0"""
-        bt = _create_bt()
+        bt = create_bt()
         bt.goto(5)
         assert bt.position.pl_pct == 0
 
@@ -148,27 +132,9 @@ class TestPositionPL:
 class TestPositionDirection:
     """Position.is_long / is_short のテスト"""
 
-    def test_is_long(self):
-        """ロングポジション"""
-        bt = _create_bt()
-        bt.goto(5)
-        bt.buy(code="TEST", size=10)
-        bt.step()
-        assert bt.position.is_long is True
-        assert bt.position.is_short is False
-
-    def test_is_short(self):
-        """ショートポジション"""
-        bt = _create_bt()
-        bt.goto(5)
-        bt.sell(code="TEST", size=10)
-        bt.step()
-        assert bt.position.is_short is True
-        assert bt.position.is_long is False
-
-    def test_neither_when_flat(self):
+    def test_neither_when_flat(self, create_bt):
         """ポジションなしの場合はどちらもFalse"""
-        bt = _create_bt()
+        bt = create_bt()
         bt.goto(5)
         assert bt.position.is_long is False
         assert bt.position.is_short is False
@@ -177,9 +143,9 @@ class TestPositionDirection:
 class TestPositionClose:
     """Position.close() のテスト"""
 
-    def test_close_full(self):
+    def test_close_full(self, create_bt):
         """全ポジション決済"""
-        bt = _create_bt()
+        bt = create_bt()
         bt.goto(5)
         bt.buy(code="TEST", size=10)
         bt.step()
@@ -188,9 +154,9 @@ class TestPositionClose:
         bt.step()
         assert bt.position.size == 0
 
-    def test_close_partial(self):
+    def test_close_partial(self, create_bt):
         """部分決済"""
-        bt = _create_bt()
+        bt = create_bt()
         bt.goto(5)
         bt.buy(code="TEST", size=10)
         bt.step()
@@ -199,9 +165,9 @@ class TestPositionClose:
         bt.step()
         assert bt.position.size < initial_size
 
-    def test_close_short_position(self):
+    def test_close_short_position(self, create_bt):
         """ショートポジションの決済"""
-        bt = _create_bt()
+        bt = create_bt()
         bt.goto(5)
         bt.sell(code="TEST", size=10)
         bt.step()
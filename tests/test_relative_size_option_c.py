@@ -32,26 +32,30 @@ from datetime import datetime
 from BackcastPro import Backtest
 
 
-def create_sample_df(days: int = 100, base_price: float = 1000.0) -> pd.DataFrame:
+def create_sample_df(
+    days: int = 100, base_price: float = 1000.0, seed: int = 42
+) -> pd.DataFrame:
     """Create sample OHLC data for testing
 
     Args:
         days: Number of days of data
         base_price: Base price for the stock (default 1000 for easier calculation)
+        seed: Seed for the local random Generator
     """
     dates = pd.date_range(start="2024-01-01", periods=days, freq="D")
-    np.random.seed(42)
+    # Local Generator so the global NumPy RNG state is left untouched
+    rng = np.random.default_rng(seed)
 
     # Create stable prices for predictable testing
-    returns = np.random.randn(days) * 0.01  # 1% volatility
+    returns = rng.standard_normal(days) * 0.01  # 1% volatility
     prices = base_price * np.cumprod(1 + returns)
 
     df = pd.DataFrame({
-        "Open": prices * (1 + np.random.randn(days) * 0.002),
-        "High": prices * (1 + np.abs(np.random.randn(days) * 0.005)),
-        "Low": prices * (1 - np.abs(np.random.randn(days) * 0.005)),
+        "Open": prices * (1 + rng.standard_normal(days) * 0.002),
+        "High": prices * (1 + np.abs(rng.standard_normal(days) * 0.005)),
+        "Low": prices * (1 - np.abs(rng.standard_normal(days) * 0.005)),
         "Close": prices,
-        "Volume": np.random.randint(1000, 10000, days),
+        "Volume": rng.integers(1000, 10000, days),
     }, index=dates)
 
     return df
@@ -246,8 +250,7 @@ class TestMultiSymbolIsolation:
         df1 = create_sample_df(20, base_price=1000.0)
 
         # Use different random seed for second stock
-        np.random.seed(123)
-        df2 = create_sample_df(20, base_price=2000.0)
+        df2 = create_sample_df(20, base_price=2000.0, seed=123)
 
         bt = Backtest(data={code1: df1, code2: df2}, cash=1_000_000)
 
@@ -293,8 +296,7 @@ class TestMultiSymbolIsolation:
         code2 = "6758"
         df1 = create_sample_df(20, base_price=1000.0)
 
-        np.random.seed(123)
-        df2 = create_sample_df(20, base_price=2000.0)
+        df2 = create_sample_df(20, base_price=2000.0, seed=123)
 
         bt = Backtest(data={code1: df1, code2: df2}, cash=1_000_000)
 
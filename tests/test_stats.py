@@ -2,6 +2,8 @@
 統計計算モジュール (_stats.py) のテスト
 """
 
+import functools
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -13,6 +15,56 @@ from BackcastPro._stats import (
 )
 
 
+@functools.cache
+def _trades_template():
+    """テスト用のtrades DataFrame（各列の dtype を明示して1回だけ生成）"""
+    return pd.DataFrame.from_dict({
+        "Code": np.array(["TEST", "TEST"], dtype=object),
+        "Size": np.array([100, -100], dtype=np.int64),
+        "EntryBar": np.array([0, 5], dtype=np.int64),
+        "ExitBar": np.array([5, 10], dtype=np.int64),
+        "EntryPrice": np.array([100.0, 110.0]),
+        "ExitPrice": np.array([110.0, 105.0]),
+        "SL": np.array([None, None], dtype=object),
+        "TP": np.array([None, None], dtype=object),
+        "PnL": np.array([1000.0, 500.0]),
+        "Commission": np.array([10.0, 10.0]),
+        "ReturnPct": np.array([0.10, 0.0455]),
+        "EntryTime": np.array(["2024-01-01", "2024-01-06"], dtype="datetime64[ns]"),
+        "ExitTime": np.array(["2024-01-06", "2024-01-11"], dtype="datetime64[ns]"),
+        "Duration": np.full(2, np.timedelta64(5, "D"), dtype="timedelta64[ns]"),
+        "Tag": np.array([None, None], dtype=object),
+    }, orient="columns")
+
+
+# 取引なしの trades DataFrame の列と dtype
+_EMPTY_TRADES_SCHEMA = {
+    "Code": str,
+    "Size": "float64",
+    "EntryBar": "int64",
+    "ExitBar": "int64",
+    "EntryPrice": "float64",
+    "ExitPrice": "float64",
+    "SL": "float64",
+    "TP": "float64",
+    "PnL": "float64",
+    "Commission": "float64",
+    "ReturnPct": "float64",
+    "EntryTime": "datetime64[ns]",
+    "ExitTime": "datetime64[ns]",
+    "Duration": "timedelta64[ns]",
+    "Tag": object,
+}
+
+
+@pytest.fixture(scope="session")
+def empty_trades_df():
+    """取引なしの trades DataFrame（スキーマから1回だけ生成）"""
+    return pd.DataFrame(
+        {col: pd.array([], dtype=dtype) for col, dtype in _EMPTY_TRADES_SCHEMA.items()}
+    )
+
+
 class TestGeometricMean:
     """geometric_mean() のテスト"""
 
@@ -99,30 +151,21 @@ class TestComputeDrawdownDurationPeaks:
 class TestComputeStats:
     """compute_stats() のテスト"""
 
+    # compute_stats() は equity/index を書き換えないため、クラスで共有する
+    _INDEX_20 = pd.date_range("2024-01-01", periods=20)
+    _EQUITY_20 = np.linspace(10000, 11500, 20)
+    _EQUITY_20_SMALL = np.linspace(10000, 11000, 20)
+    _INDEX_10 = pd.date_range("2024-01-01", periods=10)
+    _FLAT_EQUITY_10 = np.full(10, 10000.0)
+
     def _make_trades_df(self):
-        """テスト用のtrades DataFrameを生成"""
-        return pd.DataFrame({
-            "Code": ["TEST", "TEST"],
-            "Size": [100, -100],
-            "EntryBar": [0, 5],
-            "ExitBar": [5, 10],
-            "EntryPrice": [100.0, 110.0],
-            "ExitPrice": [110.0, 105.0],
-            "SL": [None, None],
-            "TP": [None, None],
-            "PnL": [1000.0, 500.0],
-            "Commission": [10.0, 10.0],
-            "ReturnPct": [0.10, 0.0455],
-            "EntryTime": pd.to_datetime(["2024-01-01", "2024-01-06"]),
-            "ExitTime": pd.to_datetime(["2024-01-06", "2024-01-11"]),
-            "Duration": pd.to_timedelta(["5 days", "5 days"]),
-            "Tag": [None, None],
-        })
+        """テスト用のtrades DataFrameを生成（テンプレートのコピー）"""
+        return _trades_template().copy()
 
     def test_basic_stats(self):
         """基本的な統計値が正しく計算される"""
-        index = pd.date_range("2024-01-01", periods=20)
-        equity = np.linspace(10000, 11500, 20)
+        index = self._INDEX_20
+        equity = self._EQUITY_20
         trades_df = self._make_trades_df()
 
         stats = compute_stats(
@@ -141,27 +184,11 @@ class TestComputeStats:
         assert stats["Return [%]"] == pytest.approx(15.0)
         assert stats["Win Rate [%]"] == pytest.approx(100.0)
 
-    def test_stats_with_no_trades(self):
+    def test_stats_with_no_trades(self, empty_trades_df):
         """取引なしの場合"""
-        index = pd.date_range("2024-01-01", periods=10)
-        equity = np.full(10, 10000.0)
-        trades_df = pd.DataFrame({
-            "Code": pd.Series([], dtype=str),
-            "Size": pd.Series([], dtype=float),
-            "EntryBar": pd.Series([], dtype=int),
-            "ExitBar": pd.Series([], dtype=int),
-            "EntryPrice": pd.Series([], dtype=float),
-            "ExitPrice": pd.Series([], dtype=float),
-            "SL": pd.Series([], dtype=float),
-            "TP": pd.Series([], dtype=float),
-            "PnL": pd.Series([], dtype=float),
-            "Commission": pd.Series([], dtype=float),
-            "ReturnPct": pd.Series([], dtype=float),
-            "EntryTime": pd.Series([], dtype="datetime64[ns]"),
-            "ExitTime": pd.Series([], dtype="datetime64[ns]"),
-            "Duration": pd.Series([], dtype="timedelta64[ns]"),
-            "Tag": pd.Series([], dtype=object),
-        })
+        index = self._INDEX_10
+        equity = self._FLAT_EQUITY_10
+        trades_df = empty_trades_df
 
         stats = compute_stats(
             trades=trades_df,
@@ -177,7 +204,7 @@ class TestComputeStats:
 
     def test_stats_equity_length_mismatch(self):
         """equityとindexの長さが異なる場合"""
-        index = pd.date_range("2024-01-01", periods=10)
+        index = self._INDEX_10
         equity = np.linspace(10000, 11000, 15)  # indexより長い
         trades_df = self._make_trades_df()
 
@@ -193,8 +220,8 @@ class TestComputeStats:
 
     def test_stats_contains_equity_curve(self):
         """_equity_curveが含まれる"""
-        index = pd.date_range("2024-01-01", periods=20)
-        equity = np.linspace(10000, 11000, 20)
+        index = self._INDEX_20
+        equity = self._EQUITY_20_SMALL
         trades_df = self._make_trades_df()
 
         stats = compute_stats(
@@ -210,8 +237,8 @@ class TestComputeStats:
 
     def test_stats_risk_free_rate_validation(self):
         """risk_free_rateの範囲チェック"""
-        index = pd.date_range("2024-01-01", periods=10)
-        equity = np.full(10, 10000.0)
+        index = self._INDEX_10
+        equity = self._FLAT_EQUITY_10
         trades_df = self._make_trades_df()
 
         with pytest.raises(AssertionError):
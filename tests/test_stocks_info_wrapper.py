@@ -2,10 +2,24 @@
 trading_data.stocks_info ラッパーモジュールのテスト
 """
 
+import re
+from types import SimpleNamespace
+
 import pandas as pd
 import pytest
 from unittest.mock import patch, MagicMock
 
+from trading_data.stocks_info import stocks_info
+
+# pytest.raises(match=...) で使うエラーメッセージのパターン
+_RE_LISTED_INFO_FAILED = re.compile("日本株式上場銘柄一覧の取得に失敗")
+
+# J-Quants get_listed_info() の戻り値（Code は5桁）
+_LISTED_INFO_DF = pd.DataFrame({
+    "Code": ["72030"],
+    "CompanyName": ["トヨタ自動車"],
+})
+
 
 class TestStocksInfoFetchFromJquants:
     """stocks_info._fetch_from_jquants() のテスト"""
@@ -14,10 +28,7 @@ class TestStocksInfoFetchFromJquants:
     @patch("trading_data.stocks_info.jquants")
     def test_disabled_jquants_returns_none(self, mock_jq_cls, mock_db_cls):
         """J-Quantsが無効の場合Noneを返す"""
-        from trading_data.stocks_info import stocks_info
-
-        mock_jq = MagicMock()
-        mock_jq.isEnable = False
+        mock_jq = SimpleNamespace(isEnable=False)
         mock_jq_cls.return_value = mock_jq
         mock_db_cls.return_value = MagicMock()
 
@@ -29,31 +40,24 @@ class TestStocksInfoFetchFromJquants:
     @patch("trading_data.stocks_info.jquants")
     def test_successful_fetch_truncates_code(self, mock_jq_cls, mock_db_cls):
         """取得成功時にCodeを4文字に切り詰める"""
-        from trading_data.stocks_info import stocks_info
-
-        mock_jq = MagicMock()
-        mock_jq.isEnable = True
-        mock_jq.get_listed_info.return_value = pd.DataFrame({
-            "Code": ["72030"],
-            "CompanyName": ["トヨタ自動車"],
-        })
+        mock_jq = SimpleNamespace(
+            isEnable=True, get_listed_info=lambda **kwargs: _LISTED_INFO_DF.copy()
+        )
         mock_jq_cls.return_value = mock_jq
         mock_db_cls.return_value = MagicMock()
 
         si = stocks_info()
         result = si._fetch_from_jquants(code="7203")
         assert result is not None
-        assert result.iloc[0]["Code"] == "7203"
+        assert result["Code"].iat[0] == "7203"
 
     @patch("trading_data.stocks_info.db_stocks_info")
     @patch("trading_data.stocks_info.jquants")
     def test_empty_result_returns_none(self, mock_jq_cls, mock_db_cls):
         """空の結果はNoneを返す"""
-        from trading_data.stocks_info import stocks_info
-
-        mock_jq = MagicMock()
-        mock_jq.isEnable = True
-        mock_jq.get_listed_info.return_value = pd.DataFrame()
+        mock_jq = SimpleNamespace(
+            isEnable=True, get_listed_info=lambda **kwargs: pd.DataFrame()
+        )
         mock_jq_cls.return_value = mock_jq
         mock_db_cls.return_value = MagicMock()
 
@@ -69,10 +73,7 @@ class TestGetCompanyName:
     @patch("trading_data.stocks_info.jquants")
     def test_disabled_jquants_returns_code(self, mock_jq_cls, mock_db_cls):
         """J-Quants無効時は銘柄コードを返す"""
-        from trading_data.stocks_info import stocks_info
-
-        mock_jq = MagicMock()
-        mock_jq.isEnable = False
+        mock_jq = SimpleNamespace(isEnable=False)
         mock_jq_cls.return_value = mock_jq
         mock_db_cls.return_value = MagicMock()
 
@@ -84,14 +85,9 @@ class TestGetCompanyName:
     @patch("trading_data.stocks_info.jquants")
     def test_successful_name_retrieval(self, mock_jq_cls, mock_db_cls):
         """正常に銘柄名称を取得"""
-        from trading_data.stocks_info import stocks_info
-
-        mock_jq = MagicMock()
-        mock_jq.isEnable = True
-        mock_jq.get_listed_info.return_value = pd.DataFrame({
-            "Code": ["72030"],
-            "CompanyName": ["トヨタ自動車"],
-        })
+        mock_jq = SimpleNamespace(
+            isEnable=True, get_listed_info=lambda **kwargs: _LISTED_INFO_DF.copy()
+        )
         mock_jq_cls.return_value = mock_jq
         mock_db_cls.return_value = MagicMock()
 
@@ -101,11 +97,8 @@ class TestGetCompanyName:
 
     @patch("trading_data.stocks_info.db_stocks_info")
     @patch("trading_data.stocks_info.jquants")
-    def test_api_error_returns_code(self, mock_jq_cls, mock_db_cls):
+    def test_api_error_returns_code(self, mock_jq_cls, mock_db_cls, mock_jq):
         """APIエラー時は銘柄コードを返す"""
-        from trading_data.stocks_info import stocks_info
-
-        mock_jq = MagicMock()
         mock_jq.isEnable = True
         mock_jq.get_listed_info.side_effect = Exception("API Error")
         mock_jq_cls.return_value = mock_jq
@@ -117,16 +110,10 @@ class TestGetCompanyName:
 
     @patch("trading_data.stocks_info.db_stocks_info")
     @patch("trading_data.stocks_info.jquants")
-    def test_code_with_suffix_stripped(self, mock_jq_cls, mock_db_cls):
+    def test_code_with_suffix_stripped(self, mock_jq_cls, mock_db_cls, mock_jq):
         """サフィックス付きコードが処理される"""
-        from trading_data.stocks_info import stocks_info
-
-        mock_jq = MagicMock()
         mock_jq.isEnable = True
-        mock_jq.get_listed_info.return_value = pd.DataFrame({
-            "Code": ["72030"],
-            "CompanyName": ["トヨタ自動車"],
-        })
+        mock_jq.get_listed_info.return_value = _LISTED_INFO_DF.copy()
         mock_jq_cls.return_value = mock_jq
         mock_db_cls.return_value = MagicMock()
 
@@ -136,6 +123,34 @@ class TestGetCompanyName:
         mock_jq.get_listed_info.assert_called_with(code="7203")
         assert result == "トヨタ自動車"
 
+    @patch("trading_data.stocks_info.db_stocks_info")
+    @patch("trading_data.stocks_info.jquants")
+    def test_repeated_lookup_is_cached(self, mock_jq_cls, mock_db_cls, mock_jq):
+        """同じ銘柄コード（サフィックス違いを含む）はJ-Quantsに1回だけ問い合わせる"""
+        mock_jq.isEnable = True
+        mock_jq.get_listed_info.return_value = _LISTED_INFO_DF.copy()
+        mock_jq_cls.return_value = mock_jq
+        mock_db_cls.return_value = MagicMock()
+
+        si = stocks_info()
+        assert si.get_company_name("7203") == "トヨタ自動車"
+        assert si.get_company_name("7203.JP") == "トヨタ自動車"
+        mock_jq.get_listed_info.assert_called_once_with(code="7203")
+
+    @patch("trading_data.stocks_info.db_stocks_info")
+    @patch("trading_data.stocks_info.jquants")
+    def test_missing_name_is_not_cached(self, mock_jq_cls, mock_db_cls, mock_jq):
+        """銘柄名称が取得できなかったコードはキャッシュせず、次回も問い合わせる"""
+        mock_jq.isEnable = True
+        mock_jq.get_listed_info.return_value = pd.DataFrame()
+        mock_jq_cls.return_value = mock_jq
+        mock_db_cls.return_value = MagicMock()
+
+        si = stocks_info()
+        assert si.get_company_name("7203") == "7203"
+        assert si.get_company_name("7203") == "7203"
+        assert mock_jq.get_listed_info.call_count == 2
+
 
 class TestStocksInfoGetJapaneseListed:
     """stocks_info.get_japanese_listed_info() のテスト"""
@@ -144,14 +159,9 @@ class TestStocksInfoGetJapaneseListed:
     @patch("trading_data.stocks_info.jquants")
     def test_jquants_success_saves_to_db(self, mock_jq_cls, mock_db_cls):
         """J-Quants成功時にDBに保存"""
-        from trading_data.stocks_info import stocks_info
-
-        mock_jq = MagicMock()
-        mock_jq.isEnable = True
-        mock_jq.get_listed_info.return_value = pd.DataFrame({
-            "Code": ["72030"],
-            "CompanyName": ["トヨタ自動車"],
-        })
+        mock_jq = SimpleNamespace(
+            isEnable=True, get_listed_info=lambda **kwargs: _LISTED_INFO_DF.copy()
+        )
         mock_jq_cls.return_value = mock_jq
 
         mock_db = MagicMock()
@@ -166,10 +176,7 @@ class TestStocksInfoGetJapaneseListed:
     @patch("trading_data.stocks_info.jquants")
     def test_fallback_to_cache(self, mock_jq_cls, mock_db_cls):
         """J-Quants失敗時にキャッシュにフォールバック"""
-        from trading_data.stocks_info import stocks_info
-
-        mock_jq = MagicMock()
-        mock_jq.isEnable = False
+        mock_jq = SimpleNamespace(isEnable=False)
         mock_jq_cls.return_value = mock_jq
 
         cached_df = pd.DataFrame({
@@ -189,10 +196,7 @@ class TestStocksInfoGetJapaneseListed:
     @patch("trading_data.stocks_info.jquants")
     def test_all_fail_raises(self, mock_jq_cls, mock_db_cls):
         """全てのソースが失敗した場合ValueError"""
-        from trading_data.stocks_info import stocks_info
-
-        mock_jq = MagicMock()
-        mock_jq.isEnable = False
+        mock_jq = SimpleNamespace(isEnable=False)
         mock_jq_cls.return_value = mock_jq
 
         mock_db = MagicMock()
@@ -201,5 +205,5 @@ class TestStocksInfoGetJapaneseListed:
         mock_db_cls.return_value = mock_db
 
         si = stocks_info()
-        with pytest.raises(ValueError, match="日本株式上場銘柄一覧の取得に失敗"):
+        with pytest.raises(ValueError, match=_RE_LISTED_INFO_FAILED):
             si.get_japanese_listed_info(code="9999")
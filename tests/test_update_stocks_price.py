@@ -1,37 +1,36 @@
 """tests for cloud-job/update_stocks_price.py"""
-import os
-import sys
 import logging
 import argparse
+import threading
 from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, create_autospec
 
 import pandas as pd
 import pytest
 
-# cloud-job/ はパッケージ外なので sys.path に追加
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cloud-job')))
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from BackcastPro.api.db_stocks_daily import db_stocks_daily
+from trading_data.stocks_info import stocks_info
+from trading_data.stocks_price import stocks_price
 
 import update_stocks_price as usp
-from update_stocks_price import parse_arguments, merge_jquants_priority
+from update_stocks_price import parse_arguments
 
 
-# ---------------------------------------------------------------------------
-# helpers
-# ---------------------------------------------------------------------------
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    """main() の J-Quants リトライ待機（time.sleep）を待たずに進める"""
+    monkeypatch.setattr('update_stocks_price.time.sleep', lambda *_: None)
 
-def _make_price_df(dates, close_values, code="7203"):
-    """テスト用の株価DataFrameを作成"""
-    return pd.DataFrame({
-        'Date': pd.to_datetime(dates),
-        'Open': close_values,
-        'High': close_values,
-        'Low': close_values,
-        'Close': close_values,
-        'Volume': [1000] * len(dates),
-        'Code': [code] * len(dates),
-    })
+
+@pytest.fixture
+def sp_mock(monkeypatch):
+    """main() が生成する stocks_price インスタンスのモック（stocks_price の spec 付き）"""
+    sp = create_autospec(stocks_price, instance=True)
+    # __init__ で設定される db はクラスの spec に含まれないため個別に用意する
+    sp.db = create_autospec(db_stocks_daily, instance=True)
+    monkeypatch.setattr('update_stocks_price.stocks_price', lambda: sp)
+    return sp
 
 
 # ===========================================================================
@@ -41,81 +40,19 @@ def _make_price_df(dates, close_values, code="7203"):
 class TestParseArguments:
     """CLI引数のパース"""
 
-    def test_defaults(self):
-        with patch('sys.argv', ['update_stocks_price.py']):
-            args = parse_arguments()
-        assert args.codes is None
-        assert args.days == 7
-
-    def test_codes_argument(self):
-        with patch('sys.argv', ['prog', '--codes', '7203,8306']):
+    @pytest.mark.parametrize("argv,attr,expected", [
+        (['update_stocks_price.py'], 'codes', None),
+        (['update_stocks_price.py'], 'days', 7),
+        (['prog', '--codes', '7203,8306'], 'codes', '7203,8306'),
+        (['prog', '--days', '30'], 'days', 30),
+        (['update_stocks_price.py'], 'workers', 1),
+        (['prog', '--workers', '8'], 'workers', 8),
+    ], ids=['default_codes', 'default_days', 'codes', 'days_custom',
+            'default_workers', 'workers_custom'])
+    def test_parse(self, argv, attr, expected):
+        with patch('sys.argv', argv):
             args = parse_arguments()
-        assert args.codes == '7203,8306'
-
-    def test_days_custom(self):
-        with patch('sys.argv', ['prog', '--days', '30']):
-            args = parse_arguments()
-        assert args.days == 30
-
-
-# ===========================================================================
-# TestMergeJquantsPriority
-# ===========================================================================
-
-class TestMergeJquantsPriority:
-    """J-Quants優先マージ"""
-
-    def test_base_none_returns_jquants(self):
-        jq_df = _make_price_df(['2024-01-01', '2024-01-02'], [200, 201])
-        result = merge_jquants_priority(None, jq_df)
-        assert len(result) == 2
-
-    def test_base_empty_returns_jquants(self):
-        jq_df = _make_price_df(['2024-01-01'], [200])
-        result = merge_jquants_priority(pd.DataFrame(), jq_df)
-        assert len(result) == 1
-
-    def test_jquants_none_returns_base(self):
-        base_df = _make_price_df(['2024-01-01'], [100])
-        result = merge_jquants_priority(base_df, None)
-        assert len(result) == 1
-
-    def test_jquants_empty_returns_base(self):
-        base_df = _make_price_df(['2024-01-01'], [100])
-        result = merge_jquants_priority(base_df, pd.DataFrame())
-        assert len(result) == 1
-
-    def test_both_none(self):
-        result = merge_jquants_priority(None, None)
-        assert result is None
-
-    def test_no_overlap_concatenates(self):
-        base = _make_price_df(['2024-01-01', '2024-01-02'], [100, 101])
-        jq = _make_price_df(['2024-01-03', '2024-01-04'], [200, 201])
-        result = merge_jquants_priority(base, jq)
-        assert len(result) == 4
-
-    def test_overlap_jquants_wins(self):
-        base = _make_price_df(['2024-01-01'], [100])
-        jq = _make_price_df(['2024-01-01'], [200])
-        result = merge_jquants_priority(base, jq)
-        assert len(result) == 1
-        assert result['Close'].iloc[0] == 200
-
-    def test_partial_overlap(self):
-        base = _make_price_df(['2024-01-01', '2024-01-02', '2024-01-03'], [100, 101, 102])
-        jq = _make_price_df(['2024-01-02', '2024-01-03', '2024-01-04'], [200, 201, 202])
-        result = merge_jquants_priority(base, jq)
-        assert len(result) == 4
-        result_sorted = result.sort_index()
-        assert result_sorted['Close'].iloc[1] == 200  # Jan 2
-        assert result_sorted['Close'].iloc[2] == 201  # Jan 3
-
-    def test_result_sorted_by_date(self):
-        base = _make_price_df(['2024-01-03'], [100])
-        jq = _make_price_df(['2024-01-01'], [200])
-        result = merge_jquants_priority(base, jq)
-        assert result.index.is_monotonic_increasing
+        assert getattr(args, attr) == expected
 
 
 # ===========================================================================
@@ -125,25 +62,33 @@ class TestMergeJquantsPriority:
 class TestMain:
     """main() 統合テスト"""
 
-    @patch('update_stocks_price.stocks_price')
-    @patch('update_stocks_price.jquants_cls')
-    @patch('update_stocks_price.e_api')
-    def test_main_with_codes_success(self, mock_eapi, mock_jq, mock_sp_cls):
-        sp = MagicMock()
-        mock_sp_cls.return_value = sp
-        jq_df = _make_price_df(['2024-01-01'], [200])
-        sp._fetch_from_tachibana.return_value = _make_price_df(['2024-01-01'], [100])
-        sp._fetch_from_jquants.return_value = jq_df
+    @pytest.fixture(autouse=True)
+    def _main_mocks(self, monkeypatch):
+        """main() が生成する外部接続（J-Quants / e支店 / マザーDB）をまとめてモックに差し替える"""
+        mocks = SimpleNamespace(
+            jquants=MagicMock(),
+            e_api=MagicMock(),
+            mother_db=MagicMock(),
+        )
+        monkeypatch.setattr('update_stocks_price.jquants_cls', mocks.jquants)
+        monkeypatch.setattr('update_stocks_price.e_api', mocks.e_api)
+        monkeypatch.setattr('update_stocks_price.db_stocks_daily_mother', mocks.mother_db)
+        return mocks
+
+    def test_main_with_codes_success(self, _main_mocks, sp_mock, make_price_df):
+        jq_df = make_price_df(['2024-01-01'], [200])
+        sp_mock._fetch_from_tachibana.return_value = make_price_df(['2024-01-01'], [100])
+        sp_mock._fetch_from_jquants.return_value = jq_df
 
         with patch('sys.argv', ['prog', '--codes', '7203']):
             result = usp.main()
 
         assert result == 0
-        sp.db.save_stock_prices.assert_called_once()
+        _main_mocks.mother_db.return_value.save_stock_prices.assert_called_once()
 
     @patch('update_stocks_price.stocks_info')
     def test_main_no_codes_returns_1(self, mock_si_cls):
-        mock_si = MagicMock()
+        mock_si = create_autospec(stocks_info, instance=True)
         mock_si._fetch_from_jquants.return_value = pd.DataFrame()
         mock_si_cls.return_value = mock_si
 
@@ -151,33 +96,65 @@ class TestMain:
             result = usp.main()
         assert result == 1
 
-    @patch('update_stocks_price.stocks_price')
-    @patch('update_stocks_price.jquants_cls')
-    @patch('update_stocks_price.e_api')
-    def test_main_all_fail_returns_1(self, mock_eapi, mock_jq, mock_sp_cls):
-        sp = MagicMock()
-        mock_sp_cls.return_value = sp
-        sp._fetch_from_tachibana.side_effect = Exception("fail")
-        sp._fetch_from_stooq.side_effect = Exception("fail")
-        sp._fetch_from_jquants.side_effect = Exception("fail")
+    def test_main_all_fail_returns_1(self, sp_mock):
+        sp_mock._fetch_from_tachibana.side_effect = Exception("fail")
+        sp_mock._fetch_from_stooq.side_effect = Exception("fail")
+        sp_mock._fetch_from_jquants.side_effect = Exception("fail")
 
         with patch('sys.argv', ['prog', '--codes', '7203']):
             result = usp.main()
         assert result == 1
 
-    @patch('update_stocks_price.stocks_price')
-    @patch('update_stocks_price.jquants_cls')
-    @patch('update_stocks_price.e_api')
-    def test_stooq_fallback_when_tachibana_fails(self, mock_eapi, mock_jq, mock_sp_cls):
-        sp = MagicMock()
-        mock_sp_cls.return_value = sp
-        sp._fetch_from_tachibana.return_value = None
-        sp._fetch_from_stooq.return_value = _make_price_df(['2024-01-01'], [150])
-        sp._fetch_from_jquants.return_value = None
+    def test_stooq_fallback_when_tachibana_fails(self, _main_mocks, sp_mock, make_price_df):
+        sp_mock._fetch_from_tachibana.return_value = None
+        sp_mock._fetch_from_stooq.return_value = make_price_df(['2024-01-01'], [150])
+        sp_mock._fetch_from_jquants.return_value = None
 
         with patch('sys.argv', ['prog', '--codes', '7203']):
             result = usp.main()
 
         assert result == 0
-        sp._fetch_from_stooq.assert_called_once()
-        sp.db.save_stock_prices.assert_called_once()
+        sp_mock._fetch_from_stooq.assert_called_once()
+        _main_mocks.mother_db.return_value.save_stock_prices.assert_called_once()
+
+    def test_main_parallel(self, _main_mocks, sp_mock, make_price_df):
+        """--workers 2 で4銘柄を並行取得しても全銘柄が保存される"""
+        sp_mock._fetch_from_jquants.return_value = make_price_df(['2024-01-01'], [200])
+
+        with patch('sys.argv', ['prog', '--codes', '7203,8306,9984,6758', '--workers', '2']):
+            result = usp.main()
+
+        assert result == 0
+        mother_db = _main_mocks.mother_db.return_value
+        saved_codes = [c.args[0] for c in mother_db.save_stock_prices.call_args_list]
+        assert saved_codes == ['7203', '8306', '9984', '6758']
+
+    def test_main_parallel_uses_client_per_worker(self, monkeypatch, make_price_df):
+        """--workers 2 では stocks_price をスレッド間で共有せず、ワーカーごとに生成する"""
+        clients = []
+        lock = threading.Lock()
+
+        def _make_client():
+            sp = create_autospec(stocks_price, instance=True)
+            sp.used_by = set()
+
+            def _fetch_from_jquants(code, from_, to):
+                sp.used_by.add(threading.get_ident())
+                return make_price_df(['2024-01-01'], [200])
+
+            sp._fetch_from_jquants.side_effect = _fetch_from_jquants
+            with lock:
+                clients.append(sp)
+            return sp
+
+        monkeypatch.setattr('update_stocks_price.stocks_price', _make_client)
+
+        with patch('sys.argv', ['prog', '--codes', '7203,8306,9984,6758', '--workers', '2']):
+            result = usp.main()
+
+        assert result == 0
+        workers = [sp for sp in clients if sp.used_by]
+        # main() の事前初期化分を除き、取得に使われたクライアントはワーカー数以下
+        assert 1 <= len(workers) <= 2
+        assert all(len(sp.used_by) == 1 for sp in workers)
+        assert len({tid for sp in workers for tid in sp.used_by}) == len(workers)
@@ -4,42 +4,44 @@
 
 from datetime import date, datetime
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from trading_data.lib.util import PRICE_LIMIT_TABLE, _Timestamp
+from trading_data.lib.util import (
+    PRICE_LIMIT_TABLE,
+    _Timestamp,
+    _parse_fixed_format_str,
+    price_limit_array,
+)
 
 
 class TestTimestamp:
     """_Timestamp() のテスト"""
 
+    @pytest.fixture(autouse=True)
+    def _clear_parse_cache(self):
+        """文字列解析のキャッシュをテストごとに空にする"""
+        _parse_fixed_format_str.cache_clear()
+        yield
+        _parse_fixed_format_str.cache_clear()
+
     def test_none_returns_none(self):
         """Noneを渡すとNoneが返る"""
         assert _Timestamp(None) is None
 
-    def test_string_date(self):
-        """文字列日付をTimestampに変換"""
-        result = _Timestamp("2024-01-15")
-        assert isinstance(result, pd.Timestamp)
-        assert result.year == 2024
-        assert result.month == 1
-        assert result.day == 15
-
-    def test_datetime_object(self):
-        """datetimeオブジェクトをTimestampに変換"""
-        dt = datetime(2024, 6, 15, 10, 30)
-        result = _Timestamp(dt)
+    @pytest.mark.parametrize("value,expected", [
+        ("2024-01-15", pd.Timestamp(2024, 1, 15)),
+        (datetime(2024, 6, 15, 10, 30), pd.Timestamp(2024, 6, 15, 10, 30)),
+        (date(2024, 3, 1), pd.Timestamp(2024, 3, 1)),
+        ("2024/01/15", pd.Timestamp(2024, 1, 15)),              # 日本語日付形式
+        ("2024-01-15T10:30:00", pd.Timestamp(2024, 1, 15, 10, 30)),  # ISO 8601形式
+    ], ids=["string", "datetime", "date", "slash", "iso"])
+    def test_converts(self, value, expected):
+        """文字列・datetime・dateをTimestampに変換"""
+        result = _Timestamp(value)
         assert isinstance(result, pd.Timestamp)
-        assert result.year == 2024
-        assert result.month == 6
-
-    def test_date_object(self):
-        """dateオブジェクトをTimestampに変換"""
-        d = date(2024, 3, 1)
-        result = _Timestamp(d)
-        assert isinstance(result, pd.Timestamp)
-        assert result.year == 2024
-        assert result.month == 3
+        assert result == expected
 
     def test_pd_timestamp(self):
         """pd.Timestampはそのまま返される"""
@@ -52,26 +54,82 @@ class TestTimestamp:
         with pytest.raises(ValueError, match="日付パラメータの形式が不正"):
             _Timestamp("not-a-date")
 
-    def test_japanese_date_format(self):
-        """日本語日付形式"""
-        result = _Timestamp("2024/01/15")
+    @pytest.mark.parametrize("value", [
+        "2024-01-15",
+        "2024-01-15T10:30:00",
+        "2024-01-15 10:30:00.123456",
+        "2024-01-15T10:30:00+09:00",
+        "2024-01-15T10:30:00Z",
+        "2024/01/15",
+        "2024/1/5",
+        "2024-1-5",
+        "2024-01-15 10:30:00.123456789",  # 7桁以上の小数秒はナノ秒まで保持
+    ])
+    def test_matches_pandas_parser(self, value):
+        """ISO高速パスを含め、pandas.to_datetime と同じ結果になる"""
+        result = _Timestamp(value)
+        expected = pd.to_datetime(value)
+        assert result == expected
+        assert result.tz == expected.tz
+
+    @pytest.mark.parametrize("value", [
+        datetime(2024, 6, 15, 10, 30),
+        date(2024, 3, 1),
+        pd.Timestamp("2024-01-01", tz="Asia/Tokyo"),
+        np.datetime64("2024-01-15T10:30"),
+    ])
+    def test_non_string_matches_pandas(self, value):
+        """文字列以外の入力も pandas.to_datetime と同じ値・タイムゾーンになる"""
+        result = _Timestamp(value)
+        expected = pd.to_datetime(value)
         assert isinstance(result, pd.Timestamp)
-        assert result.day == 15
+        assert result == expected
+        assert result.tz == expected.tz
+
+    def test_repeated_string_is_cached(self):
+        """同じ文字列は2回目以降キャッシュから返される"""
+        first = _Timestamp("2024-01-15")
+        second = _Timestamp("2024-01-15")
+        assert second == first
+        assert _parse_fixed_format_str.cache_info().hits == 1
+
+    def test_invalid_string_raises_every_time(self):
+        """解析に失敗した文字列は毎回ValueError"""
+        for _ in range(2):
+            with pytest.raises(ValueError, match="日付パラメータの形式が不正"):
+                _Timestamp("not-a-date")
+
+    def test_relative_string_is_not_cached(self, monkeypatch):
+        """"now" など pandas に任せる文字列は毎回解析され、結果が固定されない"""
+        calls = []
+        to_datetime = pd.to_datetime
+
+        def spy(value, *args, **kwargs):
+            calls.append(value)
+            return to_datetime(value, *args, **kwargs)
+
+        monkeypatch.setattr(pd, "to_datetime", spy)
+        _Timestamp("now")
+        _Timestamp("now")
+        assert calls == ["now", "now"]
+
+    def test_iso_week_date_raises(self):
+        """pandas が受け付けない週番号形式はValueError"""
+        with pytest.raises(ValueError, match="日付パラメータの形式が不正"):
+            _Timestamp("2024-W03-1")
 
-    def test_iso_format(self):
-        """ISO 8601形式"""
-        result = _Timestamp("2024-01-15T10:30:00")
-        assert isinstance(result, pd.Timestamp)
-        assert result.hour == 10
-        assert result.minute == 30
+    def test_invalid_slash_date_raises(self):
+        """存在しないスラッシュ区切りの日付はValueError"""
+        with pytest.raises(ValueError, match="日付パラメータの形式が不正"):
+            _Timestamp("2024/13/45")
 
 
 class TestPriceLimitTable:
     """PRICE_LIMIT_TABLE のテスト"""
 
-    def test_table_is_list(self):
-        """テーブルがリスト"""
-        assert isinstance(PRICE_LIMIT_TABLE, list)
+    def test_table_is_tuple(self):
+        """テーブルが変更できないタプル"""
+        assert isinstance(PRICE_LIMIT_TABLE, tuple)
 
     def test_table_not_empty(self):
         """テーブルが空でない"""
@@ -111,3 +169,32 @@ class TestPriceLimitTable:
         table_dict = {price: width for price, width in PRICE_LIMIT_TABLE}
         for price, width in expected.items():
             assert table_dict[price] == width
+
+
+class TestPriceLimitArray:
+    """price_limit_array() のテスト"""
+
+    @pytest.mark.parametrize("price,expected", [
+        (50.0, 30),
+        (99.9, 30),
+        (100.0, 50),     # 上限ちょうどは次の区分
+        (1000.0, 300),
+        (29999.0, 5000),
+        (1e9, 10000),
+    ])
+    def test_width(self, price, expected):
+        """基準価格が上限未満となる最初の区分の値幅を返す"""
+        assert price_limit_array([price])[0] == expected
+
+    def test_non_finite_is_nan(self):
+        """NaN・inf・-infはどの区分にも該当せずNaN"""
+        result = price_limit_array([np.nan, np.inf, -np.inf, 50.0])
+        assert np.isnan(result[:3]).all()
+        assert result[3] == 30
+
+    def test_array_shape_and_dtype(self):
+        """入力と同じ形の float64 配列でまとめて返す"""
+        prices = np.array([50.0, 100.0, 499.9, 500.0, 7000.0, 45000.0])
+        result = price_limit_array(prices)
+        assert result.dtype == np.float64
+        np.testing.assert_array_equal(result, [30, 50, 80, 100, 1500, 10000])